@@ -5,36 +5,137 @@ import json
 import pytz
 import a2s
 import asyncio
+import contextlib
 import discord
 import requests
 import io
+import functools
+import gzip
+import socket
+import struct
+import threading
 from datetime import datetime, timedelta
 from discord.ext import commands, tasks
 from discord import app_commands
 from typing import Literal, Optional
-from mcrcon import MCRcon
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from itertools import islice
 
 # HTTP server for receiving CS2 logs
+import aiohttp
 from aiohttp import web
 
 # Discord UI components
 from discord.ui import Button, View
 
+# orjson is optional — noticeably faster for the big API payloads and fshost JSON
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_dumps(data) -> bytes:
+    """Serialize like json.dumps(data, default=str): datetimes/Decimals fall back to str()."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=str,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, default=str).encode()
+
+def _json_loads(raw):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+# Shared outbound HTTP client for code running on the event loop (keeps
+# connections alive between calls). Created lazily inside the running loop.
+_HTTP_SESSION: aiohttp.ClientSession | None = None
+
+def _get_http_session() -> aiohttp.ClientSession:
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None or _HTTP_SESSION.closed:
+        _HTTP_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=15),
+        )
+    return _HTTP_SESSION
+
 # Path to stats.html — served directly as a static file
 HTML_PATH = pathlib.Path(__file__).parent / "stats.html"
 
+# stats.html / admin.html kept in memory:
+#   path -> ((mtime_ns, size), body, gzipped body, etag)
+# A stat per request catches edits on disk; the file is only re-read (and
+# re-compressed) when it changed. Blocking, so callers run it in the executor;
+# start_http_server warms it before the first request.
+_PAGE_CACHE: dict = {}
+
+def _load_page(path: pathlib.Path):
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    entry = _PAGE_CACHE.get(path)
+    if entry is None or entry[0] != key:
+        body = path.read_bytes()
+        entry = (key, body, gzip.compress(body, compresslevel=9),
+                 f'"{st.st_mtime_ns:x}-{st.st_size:x}"')
+        _PAGE_CACHE[path] = entry
+    return entry[1:]
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if an Accept-Encoding header allows gzip, honouring q-values
+    ("gzip;q=0" refuses it) and the "*" wildcard."""
+    wildcard = False
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.strip().lower()
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard = q > 0
+    return wildcard
+
+async def _page_response(request, path: pathlib.Path):
+    """Serve a static HTML page from memory; raises FileNotFoundError if it is missing."""
+    body, body_gz, etag = await asyncio.get_running_loop().run_in_executor(None, _load_page, path)
+    use_gzip = _accepts_gzip(request.headers.get("Accept-Encoding", ""))
+    if use_gzip:
+        # Distinct validator per representation
+        body, etag = body_gz, etag[:-1] + '-gz"'
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return web.Response(body=body, content_type="text/html", charset="utf-8",
+                        headers=headers)
+
+
+
+# Health probe body, encoded once (polled every few seconds by Railway/uptime monitors)
+_HEALTH_BODY = b'Bot is running'
 
-
-# Regex to extract every "name<slot><steamid><team>" actor token in a log line
 async def handle_health_check(request):
-    return web.Response(text='Bot is running')
+    return web.Response(body=_HEALTH_BODY, content_type='text/plain', charset='utf-8')
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # STATS WEBSITE API ENDPOINTS
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _blocking_handler(fn):
+    """Wrap a synchronous (MySQL / fshost bound) handler so it runs in the default executor."""
+    @functools.wraps(fn)
+    async def handler(request):
+        return await asyncio.get_running_loop().run_in_executor(None, fn, request)
+    return handler
+
 def _json_response(data, max_age=0):
     headers = {"Access-Control-Allow-Origin": "*"}
     if max_age > 0:
@@ -42,7 +143,7 @@ def _json_response(data, max_age=0):
     else:
         headers["Cache-Control"] = "no-cache"
     return web.Response(
-        text=json.dumps(data, default=str),
+        body=_json_dumps(data),
         content_type='application/json',
         headers=headers,
     )
@@ -60,11 +161,14 @@ _API_CACHE_TTL = {
     'specialists':  60,
     'mapstats':     60,
     'teams':        60,
+    'mz_leaderboard': 120,
+    'mz_recent':      60,
 }
 
 def _cache_get(key: str):
+    """Keys may carry a ':<arg>' suffix; the TTL is looked up by the part before it."""
     entry = _API_CACHE.get(key)
-    if entry and (_time.monotonic() - entry['ts']) < _API_CACHE_TTL.get(key, 30):
+    if entry and (_time.monotonic() - entry['ts']) < _API_CACHE_TTL.get(key.split(':', 1)[0], 30):
         return entry['data']
     return None
 
@@ -73,13 +177,40 @@ def _cache_set(key: str, data):
     return data
 
 def _cache_bust(*keys):
-    for k in keys:
-        _API_CACHE.pop(k, None)
+    """Drop each key and every '<key>:<arg>' variant of it."""
+    for cached in list(_API_CACHE):
+        if cached in keys or cached.split(':', 1)[0] in keys:
+            _API_CACHE.pop(cached, None)
+
+# Bounded TTL caches for per-player lookups (arbitrary keys, so LRU-capped).
+# Each is an OrderedDict of key -> (stored_at, data); safe to share with executor threads.
+def _lru_get(cache: OrderedDict, key, ttl: float):
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if _time.monotonic() - entry[0] >= ttl:
+        cache.pop(key, None)
+        return None
+    try:
+        cache.move_to_end(key)
+    except KeyError:
+        pass
+    return entry[1]
+
+def _lru_set(cache: OrderedDict, key, data, maxsize: int):
+    cache[key] = (_time.monotonic(), data)
+    cache.move_to_end(key)
+    while len(cache) > maxsize:
+        try:
+            cache.popitem(last=False)
+        except KeyError:
+            break
+    return data
 
-async def handle_api_player(request):
+@_blocking_handler
+def handle_api_player(request):
     """GET /api/player/{name} — full career stats, MatchZy primary / fshost fallback"""
     name = request.match_info.get('name', '')
-    loop = asyncio.get_running_loop()
 
     # ── Helper: build career + recent from fshost data ────────────────────────
     def _fshost_career_for(lookup_name):
@@ -160,33 +291,122 @@ async def handle_api_player(request):
     career = None
     recent = []
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
 
-        # Step 1: resolve steamid64 for this player name.
-        # A player may have changed their name, so rows exist under multiple names
-        # all sharing the same steamid64. We resolve the SID first, then aggregate
-        # ALL rows by SID so no matches are missed.
-        name_map = _edited_name_map()
+            # Step 1: resolve steamid64 for this player name.
+            # A player may have changed their name, so rows exist under multiple names
+            # all sharing the same steamid64. We resolve the SID first, then aggregate
+            # ALL rows by SID so no matches are missed.
+            name_map = _edited_name_map()
 
-        # Check edited name map first (highest priority)
-        resolved_sid = next((sid for sid, n in name_map.items() if n == name), None)
+            # Check edited name map first (highest priority)
+            resolved_sid = next((sid for sid, n in name_map.items() if n == name), None)
 
-        # If not in edit map, look up any row with this exact name
-        if not resolved_sid:
-            c.execute(f"""
-                SELECT steamid64 FROM {MATCHZY_TABLES['players']}
-                WHERE name = %s AND steamid64 != '0'
-                LIMIT 1
-            """, (name,))
-            row = c.fetchone()
-            if row:
-                resolved_sid = to_steamid64(str(row['steamid64']))
+            # If not in edit map, look up any row with this exact name
+            if not resolved_sid:
+                c.execute(f"""
+                    SELECT steamid64 FROM {MATCHZY_TABLES['players']}
+                    WHERE name = %s AND steamid64 != '0'
+                    LIMIT 1
+                """, (name,))
+                row = c.fetchone()
+                if row:
+                    resolved_sid = to_steamid64(str(row['steamid64']))
+
+            # Aggregate ALL rows for this steamid64 regardless of name changes.
+            # Use sid_variants() so we match both SteamID64 and SteamID32 stored forms.
+            if resolved_sid:
+                sid64, sid32 = sid_variants(resolved_sid)
+                c.execute(f"""
+                    SELECT
+                        SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
+                        COUNT(DISTINCT matchid)                                      AS matches,
+                        SUM(kills)                                                   AS kills,
+                        SUM(deaths)                                                  AS deaths,
+                        SUM(assists)                                                 AS assists,
+                        SUM(head_shot_kills)                                         AS headshots,
+                        SUM(damage)                                                  AS total_damage,
+                        SUM(enemies5k)                                               AS aces,
+                        SUM(enemies4k)                                               AS quads,
+                        SUM(v1_wins)                                                 AS clutch_1v1,
+                        SUM(v2_wins)                                                 AS clutch_1v2,
+                        SUM(entry_wins)                                              AS entry_wins,
+                        SUM(entry_count)                                             AS entry_attempts,
+                        SUM(flash_successes)                                         AS flashes_thrown,
+                        ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2)                   AS kd,
+                        ROUND(SUM(head_shot_kills)/NULLIF(SUM(kills),0)*100,1)      AS hs_pct,
+                        ROUND(SUM(damage)/NULLIF(
+                            COUNT(DISTINCT CONCAT(matchid,mapnumber)),0)/30,1)      AS adr
+                    FROM {MATCHZY_TABLES['players']}
+                    WHERE CAST(steamid64 AS UNSIGNED) IN (%s, %s) AND steamid64 != '0'
+                    GROUP BY steamid64
+                """, (int(sid64), int(sid32)))
+                career = c.fetchone()
+
+            if career:
+                name_map = _edited_name_map()
+                sid = sid64  # always SteamID64 form, set above
+                if sid in name_map:
+                    career['name'] = name_map[sid]
+                c.execute(f"""
+                    SELECT p.matchid, p.mapnumber, p.team, p.steamid64,
+                        p.kills, p.deaths, p.assists, p.damage, p.head_shot_kills,
+                        p.enemies5k, p.v1_wins,
+                        m.mapname, m.team1_score, m.team2_score,
+                        mm.team1_name, mm.team2_name, mm.winner,
+                        ROUND(p.damage/30,1) AS adr,
+                        ROUND(p.head_shot_kills/NULLIF(p.kills,0)*100,1) AS hs_pct,
+                        CASE
+                            WHEN LOWER(p.team) = LOWER(mm.team1_name) THEN 'team1'
+                            WHEN LOWER(p.team) = LOWER(mm.team2_name) THEN 'team2'
+                            WHEN LOWER(p.team) IN ('team1','team_1','1') THEN 'team1'
+                            WHEN LOWER(p.team) IN ('team2','team_2','2') THEN 'team2'
+                            ELSE NULL
+                        END AS player_team,
+                        CASE
+                            WHEN LOWER(p.team) = LOWER(mm.team1_name) THEN
+                                CASE WHEN LOWER(mm.winner) = LOWER(mm.team1_name) THEN 1 ELSE 0 END
+                            WHEN LOWER(p.team) = LOWER(mm.team2_name) THEN
+                                CASE WHEN LOWER(mm.winner) = LOWER(mm.team2_name) THEN 1 ELSE 0 END
+                            ELSE NULL
+                        END AS player_won
+                    FROM {MATCHZY_TABLES['players']} p
+                    LEFT JOIN {MATCHZY_TABLES['maps']} m ON p.matchid=m.matchid AND p.mapnumber=m.mapnumber
+                    LEFT JOIN {MATCHZY_TABLES['matches']} mm ON p.matchid=mm.matchid
+                    WHERE CAST(p.steamid64 AS UNSIGNED) IN (%s, %s) AND p.steamid64 != '0'
+                    ORDER BY p.matchid DESC, p.mapnumber DESC
+                    LIMIT 20
+                """, (int(sid_variants(sid)[0]), int(sid_variants(sid)[1])))
+                recent = _patch_recent_matches(c.fetchall())
+            c.close()
+    except Exception as _e:
+        print(f"[api/player] MatchZy query error for '{name}': {_e}")
+
+    # ── Fallback to fshost ────────────────────────────────────────────────────
+    if not career:
+        career, recent = _fshost_career_for(name)
+
+    if not career:
+        return _json_response({"error": "Player not found"})
+
+    return _json_response({"career": career, "recent_matches": recent})
+
+@_blocking_handler
+def handle_api_player_by_sid(request):
+    """GET /api/player/sid/{steamid64} — look up player by SteamID (either form)."""
+    raw_sid = request.match_info.get('steamid64', '')
+
+    sid64, sid32 = sid_variants(to_steamid64(raw_sid))
+
+    career = None
+    recent = []
+    try:
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
 
-        # Aggregate ALL rows for this steamid64 regardless of name changes.
-        # Use sid_variants() so we match both SteamID64 and SteamID32 stored forms.
-        if resolved_sid:
-            sid64, sid32 = sid_variants(resolved_sid)
+            # WHERE IN (sid64, sid32) covers both forms stored in DB.
+            # GROUP BY steamid64 required for ONLY_FULL_GROUP_BY sql_mode.
             c.execute(f"""
                 SELECT
                     SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
@@ -208,141 +428,52 @@ async def handle_api_player(request):
                     ROUND(SUM(damage)/NULLIF(
                         COUNT(DISTINCT CONCAT(matchid,mapnumber)),0)/30,1)      AS adr
                 FROM {MATCHZY_TABLES['players']}
-                WHERE CAST(steamid64 AS UNSIGNED) IN (%s, %s) AND steamid64 != '0'
+                WHERE CAST(steamid64 AS UNSIGNED) IN (%s, %s)
+                  AND steamid64 != '0' AND steamid64 IS NOT NULL
                 GROUP BY steamid64
             """, (int(sid64), int(sid32)))
             career = c.fetchone()
 
-        if career:
-            name_map = _edited_name_map()
-            sid = sid64  # always SteamID64 form, set above
-            if sid in name_map:
-                career['name'] = name_map[sid]
-            c.execute(f"""
-                SELECT p.matchid, p.mapnumber, p.team, p.steamid64,
-                    p.kills, p.deaths, p.assists, p.damage, p.head_shot_kills,
-                    p.enemies5k, p.v1_wins,
-                    m.mapname, m.team1_score, m.team2_score,
-                    mm.team1_name, mm.team2_name, mm.winner,
-                    ROUND(p.damage/30,1) AS adr,
-                    ROUND(p.head_shot_kills/NULLIF(p.kills,0)*100,1) AS hs_pct,
-                    CASE
-                        WHEN LOWER(p.team) = LOWER(mm.team1_name) THEN 'team1'
-                        WHEN LOWER(p.team) = LOWER(mm.team2_name) THEN 'team2'
-                        WHEN LOWER(p.team) IN ('team1','team_1','1') THEN 'team1'
-                        WHEN LOWER(p.team) IN ('team2','team_2','2') THEN 'team2'
-                        ELSE NULL
-                    END AS player_team,
-                    CASE
-                        WHEN LOWER(p.team) = LOWER(mm.team1_name) THEN
-                            CASE WHEN LOWER(mm.winner) = LOWER(mm.team1_name) THEN 1 ELSE 0 END
-                        WHEN LOWER(p.team) = LOWER(mm.team2_name) THEN
-                            CASE WHEN LOWER(mm.winner) = LOWER(mm.team2_name) THEN 1 ELSE 0 END
-                        ELSE NULL
-                    END AS player_won
-                FROM {MATCHZY_TABLES['players']} p
-                LEFT JOIN {MATCHZY_TABLES['maps']} m ON p.matchid=m.matchid AND p.mapnumber=m.mapnumber
-                LEFT JOIN {MATCHZY_TABLES['matches']} mm ON p.matchid=mm.matchid
-                WHERE CAST(p.steamid64 AS UNSIGNED) IN (%s, %s) AND p.steamid64 != '0'
-                ORDER BY p.matchid DESC, p.mapnumber DESC
-                LIMIT 20
-            """, (int(sid_variants(sid)[0]), int(sid_variants(sid)[1])))
-            recent = _patch_recent_matches(c.fetchall())
-        c.close(); conn.close()
-    except Exception as _e:
-        print(f"[api/player] MatchZy query error for '{name}': {_e}")
-
-    # ── Fallback to fshost ────────────────────────────────────────────────────
-    if not career:
-        career, recent = await loop.run_in_executor(None, _fshost_career_for, name)
-
-    if not career:
-        return _json_response({"error": "Player not found"})
-
-    return _json_response({"career": career, "recent_matches": recent})
-
-async def handle_api_player_by_sid(request):
-    """GET /api/player/sid/{steamid64} — look up player by SteamID (either form)."""
-    raw_sid = request.match_info.get('steamid64', '')
-    loop = asyncio.get_running_loop()
+            if career:
+                career = dict(career)
+                # Always expose the real SteamID64 regardless of what DB stores
+                career['steamid64'] = sid64
+                name_map = _edited_name_map()
+                if sid64 in name_map:
+                    career['name'] = name_map[sid64]
 
-    sid64, sid32 = sid_variants(to_steamid64(raw_sid))
-
-    career = None
-    recent = []
-    try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-
-        # WHERE IN (sid64, sid32) covers both forms stored in DB.
-        # GROUP BY steamid64 required for ONLY_FULL_GROUP_BY sql_mode.
-        c.execute(f"""
-            SELECT
-                SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
-                COUNT(DISTINCT matchid)                                      AS matches,
-                SUM(kills)                                                   AS kills,
-                SUM(deaths)                                                  AS deaths,
-                SUM(assists)                                                 AS assists,
-                SUM(head_shot_kills)                                         AS headshots,
-                SUM(damage)                                                  AS total_damage,
-                SUM(enemies5k)                                               AS aces,
-                SUM(enemies4k)                                               AS quads,
-                SUM(v1_wins)                                                 AS clutch_1v1,
-                SUM(v2_wins)                                                 AS clutch_1v2,
-                SUM(entry_wins)                                              AS entry_wins,
-                SUM(entry_count)                                             AS entry_attempts,
-                SUM(flash_successes)                                         AS flashes_thrown,
-                ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2)                   AS kd,
-                ROUND(SUM(head_shot_kills)/NULLIF(SUM(kills),0)*100,1)      AS hs_pct,
-                ROUND(SUM(damage)/NULLIF(
-                    COUNT(DISTINCT CONCAT(matchid,mapnumber)),0)/30,1)      AS adr
-            FROM {MATCHZY_TABLES['players']}
-            WHERE CAST(steamid64 AS UNSIGNED) IN (%s, %s)
-              AND steamid64 != '0' AND steamid64 IS NOT NULL
-            GROUP BY steamid64
-        """, (int(sid64), int(sid32)))
-        career = c.fetchone()
-
-        if career:
-            career = dict(career)
-            # Always expose the real SteamID64 regardless of what DB stores
-            career['steamid64'] = sid64
-            name_map = _edited_name_map()
-            if sid64 in name_map:
-                career['name'] = name_map[sid64]
-
-            c.execute(f"""
-                SELECT p.matchid, p.mapnumber, p.team, p.steamid64,
-                    p.kills, p.deaths, p.assists, p.damage, p.head_shot_kills,
-                    p.enemies5k, p.v1_wins,
-                    m.mapname, m.team1_score, m.team2_score,
-                    mm.team1_name, mm.team2_name, mm.winner,
-                    ROUND(p.damage/30,1) AS adr,
-                    ROUND(p.head_shot_kills/NULLIF(p.kills,0)*100,1) AS hs_pct,
-                    CASE
-                        WHEN LOWER(p.team) = LOWER(mm.team1_name) THEN 'team1'
-                        WHEN LOWER(p.team) = LOWER(mm.team2_name) THEN 'team2'
-                        WHEN LOWER(p.team) IN ('team1','team_1','1') THEN 'team1'
-                        WHEN LOWER(p.team) IN ('team2','team_2','2') THEN 'team2'
-                        ELSE NULL
-                    END AS player_team,
-                    CASE
-                        WHEN LOWER(p.team) = LOWER(mm.team1_name) THEN
-                            CASE WHEN LOWER(mm.winner) = LOWER(mm.team1_name) THEN 1 ELSE 0 END
-                        WHEN LOWER(p.team) = LOWER(mm.team2_name) THEN
-                            CASE WHEN LOWER(mm.winner) = LOWER(mm.team2_name) THEN 1 ELSE 0 END
-                        ELSE NULL
-                    END AS player_won
-                FROM {MATCHZY_TABLES['players']} p
-                LEFT JOIN {MATCHZY_TABLES['maps']} m ON p.matchid=m.matchid AND p.mapnumber=m.mapnumber
-                LEFT JOIN {MATCHZY_TABLES['matches']} mm ON p.matchid=mm.matchid
-                WHERE CAST(p.steamid64 AS UNSIGNED) IN (%s, %s)
-                  AND p.steamid64 != '0'
-                ORDER BY p.matchid DESC, p.mapnumber DESC
-                LIMIT 20
-            """, (int(sid64), int(sid32)))
-            recent = _patch_recent_matches(c.fetchall())
-        c.close(); conn.close()
+                c.execute(f"""
+                    SELECT p.matchid, p.mapnumber, p.team, p.steamid64,
+                        p.kills, p.deaths, p.assists, p.damage, p.head_shot_kills,
+                        p.enemies5k, p.v1_wins,
+                        m.mapname, m.team1_score, m.team2_score,
+                        mm.team1_name, mm.team2_name, mm.winner,
+                        ROUND(p.damage/30,1) AS adr,
+                        ROUND(p.head_shot_kills/NULLIF(p.kills,0)*100,1) AS hs_pct,
+                        CASE
+                            WHEN LOWER(p.team) = LOWER(mm.team1_name) THEN 'team1'
+                            WHEN LOWER(p.team) = LOWER(mm.team2_name) THEN 'team2'
+                            WHEN LOWER(p.team) IN ('team1','team_1','1') THEN 'team1'
+                            WHEN LOWER(p.team) IN ('team2','team_2','2') THEN 'team2'
+                            ELSE NULL
+                        END AS player_team,
+                        CASE
+                            WHEN LOWER(p.team) = LOWER(mm.team1_name) THEN
+                                CASE WHEN LOWER(mm.winner) = LOWER(mm.team1_name) THEN 1 ELSE 0 END
+                            WHEN LOWER(p.team) = LOWER(mm.team2_name) THEN
+                                CASE WHEN LOWER(mm.winner) = LOWER(mm.team2_name) THEN 1 ELSE 0 END
+                            ELSE NULL
+                        END AS player_won
+                    FROM {MATCHZY_TABLES['players']} p
+                    LEFT JOIN {MATCHZY_TABLES['maps']} m ON p.matchid=m.matchid AND p.mapnumber=m.mapnumber
+                    LEFT JOIN {MATCHZY_TABLES['matches']} mm ON p.matchid=mm.matchid
+                    WHERE CAST(p.steamid64 AS UNSIGNED) IN (%s, %s)
+                      AND p.steamid64 != '0'
+                    ORDER BY p.matchid DESC, p.mapnumber DESC
+                    LIMIT 20
+                """, (int(sid64), int(sid32)))
+                recent = _patch_recent_matches(c.fetchall())
+            c.close()
     except Exception as _e:
         print(f"[api/player/sid] error for '{raw_sid}': {_e}")
 
@@ -352,59 +483,61 @@ async def handle_api_player_by_sid(request):
     return _json_response({"career": career, "recent_matches": recent})
 
 
-async def handle_api_player_mapstats_by_sid(request):
+@_blocking_handler
+def handle_api_player_mapstats_by_sid(request):
     """GET /api/player/sid/{steamid64}/mapstats"""
     raw_sid = request.match_info.get('steamid64', '')
     sid64, sid32 = sid_variants(to_steamid64(raw_sid))
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        c.execute(f"""
-            SELECT m.mapname,
-                COUNT(DISTINCT p.matchid)                                           AS matches,
-                SUM(p.kills) AS kills, SUM(p.deaths) AS deaths,
-                SUM(p.assists) AS assists, SUM(p.damage) AS damage,
-                SUM(p.head_shot_kills) AS headshots,
-                ROUND(SUM(p.kills)/NULLIF(SUM(p.deaths),0),2)                      AS kd,
-                ROUND(SUM(p.head_shot_kills)/NULLIF(SUM(p.kills),0)*100,1)         AS hs_pct,
-                ROUND(SUM(p.damage)/NULLIF(COUNT(DISTINCT p.matchid),0)/30,1)      AS adr,
-                SUM(CASE WHEN LOWER(mm.winner) = LOWER(p.team) THEN 1 ELSE 0 END) AS wins
-            FROM {MATCHZY_TABLES['players']} p
-            LEFT JOIN {MATCHZY_TABLES['maps']} m  ON p.matchid=m.matchid AND p.mapnumber=m.mapnumber
-            LEFT JOIN {MATCHZY_TABLES['matches']} mm ON p.matchid=mm.matchid
-            WHERE CAST(p.steamid64 AS UNSIGNED) IN (%s, %s) AND p.steamid64 != '0'
-              AND m.mapname IS NOT NULL AND m.mapname != ''
-            GROUP BY m.mapname
-            ORDER BY matches DESC
-        """, (int(sid64), int(sid32)))
-        rows = [dict(r) for r in c.fetchall()]
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute(f"""
+                SELECT m.mapname,
+                    COUNT(DISTINCT p.matchid)                                           AS matches,
+                    SUM(p.kills) AS kills, SUM(p.deaths) AS deaths,
+                    SUM(p.assists) AS assists, SUM(p.damage) AS damage,
+                    SUM(p.head_shot_kills) AS headshots,
+                    ROUND(SUM(p.kills)/NULLIF(SUM(p.deaths),0),2)                      AS kd,
+                    ROUND(SUM(p.head_shot_kills)/NULLIF(SUM(p.kills),0)*100,1)         AS hs_pct,
+                    ROUND(SUM(p.damage)/NULLIF(COUNT(DISTINCT p.matchid),0)/30,1)      AS adr,
+                    SUM(CASE WHEN LOWER(mm.winner) = LOWER(p.team) THEN 1 ELSE 0 END) AS wins
+                FROM {MATCHZY_TABLES['players']} p
+                LEFT JOIN {MATCHZY_TABLES['maps']} m  ON p.matchid=m.matchid AND p.mapnumber=m.mapnumber
+                LEFT JOIN {MATCHZY_TABLES['matches']} mm ON p.matchid=mm.matchid
+                WHERE CAST(p.steamid64 AS UNSIGNED) IN (%s, %s) AND p.steamid64 != '0'
+                  AND m.mapname IS NOT NULL AND m.mapname != ''
+                GROUP BY m.mapname
+                ORDER BY matches DESC
+            """, (int(sid64), int(sid32)))
+            rows = [dict(r) for r in c.fetchall()]
+            c.close()
         return _json_response(rows)
     except Exception as e:
         return _json_response({"error": str(e)})
 
 
-async def handle_api_debug_player(request):
+@_blocking_handler
+def handle_api_debug_player(request):
     """GET /api/debug/player/{steamid64} — raw DB lookup for debugging"""
     raw_sid = request.match_info.get('steamid64', '')
     sid64, sid32 = sid_variants(to_steamid64(raw_sid))
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        # Show all raw rows for both SID forms
-        c.execute(f"""
-            SELECT steamid64, name, matchid, kills, deaths
-            FROM {MATCHZY_TABLES['players']}
-            WHERE steamid64 IN (%s, %s)
-            LIMIT 20
-        """, (sid64, sid32))
-        rows = [dict(r) for r in c.fetchall()]
-        # Also show count with each form individually
-        c.execute(f"SELECT COUNT(*) AS cnt FROM {MATCHZY_TABLES['players']} WHERE steamid64 = %s", (sid64,))
-        cnt64 = c.fetchone()['cnt']
-        c.execute(f"SELECT COUNT(*) AS cnt FROM {MATCHZY_TABLES['players']} WHERE steamid64 = %s", (sid32,))
-        cnt32 = c.fetchone()['cnt']
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            # Show all raw rows for both SID forms
+            c.execute(f"""
+                SELECT steamid64, name, matchid, kills, deaths
+                FROM {MATCHZY_TABLES['players']}
+                WHERE steamid64 IN (%s, %s)
+                LIMIT 20
+            """, (sid64, sid32))
+            rows = [dict(r) for r in c.fetchall()]
+            # Also show count with each form individually
+            c.execute(f"SELECT COUNT(*) AS cnt FROM {MATCHZY_TABLES['players']} WHERE steamid64 = %s", (sid64,))
+            cnt64 = c.fetchone()['cnt']
+            c.execute(f"SELECT COUNT(*) AS cnt FROM {MATCHZY_TABLES['players']} WHERE steamid64 = %s", (sid32,))
+            cnt32 = c.fetchone()['cnt']
+            c.close()
         return _json_response({
             "input": raw_sid,
             "sid64": sid64,
@@ -417,7 +550,8 @@ async def handle_api_debug_player(request):
         return _json_response({"error": str(e)})
 
 
-async def handle_api_matches(request):
+@_blocking_handler
+def handle_api_matches(request):
     """
     GET /api/matches
     Primary source: fshost JSONs (all matches, correct round scores, correct dates).
@@ -428,10 +562,9 @@ async def handle_api_matches(request):
         cached = _cache_get('matches')
         if cached is not None:
             return _json_response(cached[:limit], max_age=30)
-        loop  = asyncio.get_running_loop()
 
         # ── Build match list from fshost JSONs ────────────────────────────────
-        matchid_map = await loop.run_in_executor(None, build_matchid_to_demo_map)
+        matchid_map = build_matchid_to_demo_map()
 
         results = []
         for mid, entry in matchid_map.items():
@@ -461,34 +594,34 @@ async def handle_api_matches(request):
         # ── Merge any DB-only matches not in fshost ───────────────────────────
         fshost_ids = {r['matchid'] for r in results}
         try:
-            conn = get_db()
-            c = conn.cursor(dictionary=True)
-            c.execute(f"""
-                SELECT mm.matchid, mm.team1_name, mm.team2_name, mm.winner,
-                       mm.end_time, m.mapname,
-                       m.team1_score, m.team2_score
-                FROM {MATCHZY_TABLES['matches']} mm
-                LEFT JOIN {MATCHZY_TABLES['maps']} m ON mm.matchid = m.matchid
-                WHERE mm.end_time IS NOT NULL
-                ORDER BY mm.end_time DESC
-                LIMIT %s
-            """, (limit,))
-            for row in c.fetchall():
-                mid = str(row['matchid'])
-                if mid not in fshost_ids:
-                    results.append({
-                        'matchid':     mid,
-                        'team1_name':  row.get('team1_name', 'Team 1'),
-                        'team2_name':  row.get('team2_name', 'Team 2'),
-                        'team1_score': row.get('team1_score', 0),
-                        'team2_score': row.get('team2_score', 0),
-                        'winner':      row.get('winner', ''),
-                        'end_time':    str(row.get('end_time', '')),
-                        'mapname':     row.get('mapname', '?'),
-                        'demo_url':    '',
-                        'demo_size':   '',
-                    })
-            c.close(); conn.close()
+            with db_conn() as conn:
+                c = conn.cursor(dictionary=True)
+                c.execute(f"""
+                    SELECT mm.matchid, mm.team1_name, mm.team2_name, mm.winner,
+                           mm.end_time, m.mapname,
+                           m.team1_score, m.team2_score
+                    FROM {MATCHZY_TABLES['matches']} mm
+                    LEFT JOIN {MATCHZY_TABLES['maps']} m ON mm.matchid = m.matchid
+                    WHERE mm.end_time IS NOT NULL
+                    ORDER BY mm.end_time DESC
+                    LIMIT %s
+                """, (limit,))
+                for row in c.fetchall():
+                    mid = str(row['matchid'])
+                    if mid not in fshost_ids:
+                        results.append({
+                            'matchid':     mid,
+                            'team1_name':  row.get('team1_name', 'Team 1'),
+                            'team2_name':  row.get('team2_name', 'Team 2'),
+                            'team1_score': row.get('team1_score', 0),
+                            'team2_score': row.get('team2_score', 0),
+                            'winner':      row.get('winner', ''),
+                            'end_time':    str(row.get('end_time', '')),
+                            'mapname':     row.get('mapname', '?'),
+                            'demo_url':    '',
+                            'demo_size':   '',
+                        })
+                c.close()
         except Exception as e:
             print(f"[api/matches] DB fallback error: {e}")
 
@@ -535,7 +668,7 @@ async def handle_api_match(request):
         asyncio.ensure_future(loop.run_in_executor(None, _save_raw_to_db, matchid, data))
 
         # Load edits once
-        edits  = _get_edits(matchid)
+        edits  = await loop.run_in_executor(None, _get_edits, matchid)
         t1e    = edits.get('team1', {})
         t2e    = edits.get('team2', {})
 
@@ -613,7 +746,7 @@ async def handle_api_match(request):
             elif mp.get('team') == 'team2':
                 mp['team_name'] = t2name
 
-        matchid_map = build_matchid_to_demo_map()
+        matchid_map = await loop.run_in_executor(None, build_matchid_to_demo_map)
         entry = matchid_map.get(str(matchid), {})
         demo = {
             'name': entry.get('name', ''),
@@ -741,7 +874,7 @@ def _players_from_fshost(data: dict, matchid: str) -> list:
                 hs_pct = round(hs_kills / kills * 100, 1) if kills else 0
             def cw(s):
                 try: return int(str(s).split('/')[0])
-                except: return 0
+                except ValueError: return 0
             players.append({
                 'matchid':        matchid,
                 'mapnumber':      1,
@@ -802,11 +935,11 @@ def _fetch_fshost_match_json(matchid: str) -> dict | None:
 def _get_edits(matchid: str) -> dict:
     """Load edit overrides for one match from DB. Returns {} if none."""
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        c.execute("SELECT edits_json FROM match_edits WHERE matchid = %s", (str(matchid),))
-        row = c.fetchone()
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute("SELECT edits_json FROM match_edits WHERE matchid = %s", (str(matchid),))
+            row = c.fetchone()
+            c.close()
         if row and row['edits_json']:
             return json.loads(row['edits_json'])
     except Exception as e:
@@ -825,11 +958,11 @@ def _get_all_edits() -> dict:
     if cache and now - cache['ts'] < 60:
         return cache['data']
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        c.execute("SELECT matchid, edits_json FROM match_edits")
-        rows = c.fetchall()
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute("SELECT matchid, edits_json FROM match_edits")
+            rows = c.fetchall()
+            c.close()
         data = {}
         for row in rows:
             try:
@@ -847,7 +980,9 @@ _get_all_edits._cache = {}
 def _bust_edits_cache():
     """Call this after saving edits so the cache refreshes immediately."""
     _get_all_edits._cache = {}
-    _cache_bust('matches', 'matches_full', 'leaderboard', 'specialists', 'mapstats', 'teams')
+    _PROFILE_CACHE.clear()  # profile rows embed the edited name
+    _cache_bust('matches', 'matches_full', 'leaderboard', 'specialists', 'mapstats', 'teams',
+                'mz_leaderboard', 'mz_recent')
 
 
 def _edited_name_map():
@@ -921,27 +1056,27 @@ def _get_matchzy_players_for_match(matchid: str) -> list:
     Used to detect players that left early and weren't captured by fshost.
     """
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        c.execute(f"""
-            SELECT
-                p.steamid64, p.name, p.team,
-                p.kills, p.deaths, p.assists, p.damage,
-                p.head_shot_kills,
-                p.enemies5k, p.enemies4k, p.enemies3k,
-                p.v1_wins, p.v2_wins,
-                p.entry_wins, p.entry_count,
-                p.flash_successes,
-                p.utility_damage,
-                ROUND(p.damage / 30.0, 1)                              AS adr,
-                ROUND(p.head_shot_kills / NULLIF(p.kills,0) * 100, 1) AS hs_pct,
-                mm.team1_name, mm.team2_name
-            FROM {MATCHZY_TABLES['players']} p
-            LEFT JOIN {MATCHZY_TABLES['matches']} mm ON mm.matchid = p.matchid
-            WHERE p.matchid = %s AND p.steamid64 != '0'
-        """, (str(matchid),))
-        rows = c.fetchall()
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute(f"""
+                SELECT
+                    p.steamid64, p.name, p.team,
+                    p.kills, p.deaths, p.assists, p.damage,
+                    p.head_shot_kills,
+                    p.enemies5k, p.enemies4k, p.enemies3k,
+                    p.v1_wins, p.v2_wins,
+                    p.entry_wins, p.entry_count,
+                    p.flash_successes,
+                    p.utility_damage,
+                    ROUND(p.damage / 30.0, 1)                              AS adr,
+                    ROUND(p.head_shot_kills / NULLIF(p.kills,0) * 100, 1) AS hs_pct,
+                    mm.team1_name, mm.team2_name
+                FROM {MATCHZY_TABLES['players']} p
+                LEFT JOIN {MATCHZY_TABLES['matches']} mm ON mm.matchid = p.matchid
+                WHERE p.matchid = %s AND p.steamid64 != '0'
+            """, (str(matchid),))
+            rows = c.fetchall()
+            c.close()
         # Normalise team field: MatchZy stores 'team1'/'team2' or 'CT'/'T' depending on version
         out = []
         for r in rows:
@@ -1114,15 +1249,15 @@ def _deep_merge(base: dict, overrides: dict) -> dict:
 def _save_raw_to_db(matchid: str, raw: dict):
     """Upsert the raw fshost JSON into fshost_matches table."""
     try:
-        conn = get_db()
-        c = conn.cursor()
-        c.execute("""
-            INSERT INTO fshost_matches (matchid, raw_json, fetched_at)
-            VALUES (%s, %s, NOW())
-            ON DUPLICATE KEY UPDATE raw_json = VALUES(raw_json), updated_at = NOW()
-        """, (str(matchid), json.dumps(raw, default=str)))
-        conn.commit()
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor()
+            c.execute("""
+                INSERT INTO fshost_matches (matchid, raw_json, fetched_at)
+                VALUES (%s, %s, NOW())
+                ON DUPLICATE KEY UPDATE raw_json = VALUES(raw_json), updated_at = NOW()
+            """, (str(matchid), json.dumps(raw, default=str)))
+            conn.commit()
+            c.close()
     except Exception as e:
         print(f"[DB] Save raw error for {matchid}: {e}")
 
@@ -1140,8 +1275,7 @@ def _parse_demo_filename(name: str) -> dict:
     ts_m = _re.match(r'^(\d{4}-\d{2}-\d{2})_(\d{2}-\d{2}-\d{2})', stem)
     if ts_m:
         try:
-            dt_str = f"{ts_m.group(1)} {ts_m.group(2).replace('-', ':')}"
-            result['filename_ts'] = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S").isoformat()
+            result['filename_ts'] = _parse_demo_ts(ts_m.group(0), tz=None).isoformat()
         except ValueError:
             pass
         # Everything after date_time_<something>_
@@ -1158,7 +1292,8 @@ def _parse_demo_filename(name: str) -> dict:
                 result['team2_name'] = vs_split[1].replace('_', ' ').strip()
     return result
 
-async def handle_api_demos(request):
+@_blocking_handler
+def handle_api_demos(request):
     """GET /api/demos — returns all demos from fshost with parsed timestamps and match metadata"""
     demos = fetch_all_demos_raw()
     matchid_map = build_matchid_to_demo_map()
@@ -1237,7 +1372,7 @@ def _aggregate_stats_from_fshost() -> list:
 
                     def cw(s):
                         try: return int(str(s).split('/')[0])
-                        except: return 0
+                        except ValueError: return 0
 
                     if sid not in players_agg:
                         players_agg[sid] = {
@@ -1293,41 +1428,42 @@ def _aggregate_stats_from_fshost() -> list:
         return []
 
 
-async def handle_api_leaderboard(request):
+@_blocking_handler
+def handle_api_leaderboard(request):
     """GET /api/leaderboard — career stats from matchzy_stats_players only"""
     try:
         cached = _cache_get('leaderboard')
         if cached is not None:
             return _json_response(cached, max_age=60)
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        c.execute(f"""
-            SELECT
-                steamid64,
-                SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
-                COUNT(DISTINCT matchid)                                      AS matches,
-                SUM(kills)                                                   AS kills,
-                SUM(deaths)                                                  AS deaths,
-                SUM(assists)                                                 AS assists,
-                SUM(head_shot_kills)                                         AS headshots,
-                SUM(damage)                                                  AS damage,
-                SUM(enemies5k)                                               AS aces,
-                SUM(enemies4k)                                               AS quads,
-                SUM(enemies3k)                                               AS triples,
-                SUM(v1_wins)                                                 AS clutch_wins,
-                SUM(entry_wins)                                              AS entry_wins,
-                ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2)                   AS kd,
-                ROUND(SUM(head_shot_kills)/NULLIF(SUM(kills),0)*100,1)      AS hs_pct,
-                ROUND(SUM(damage)/NULLIF(
-                    COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0)/30,1)   AS adr
-            FROM {MATCHZY_TABLES['players']}
-            WHERE steamid64 != '0' AND steamid64 IS NOT NULL
-              AND name != '' AND name IS NOT NULL
-            GROUP BY steamid64
-            ORDER BY kills DESC
-        """)
-        rows = c.fetchall()
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute(f"""
+                SELECT
+                    steamid64,
+                    SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
+                    COUNT(DISTINCT matchid)                                      AS matches,
+                    SUM(kills)                                                   AS kills,
+                    SUM(deaths)                                                  AS deaths,
+                    SUM(assists)                                                 AS assists,
+                    SUM(head_shot_kills)                                         AS headshots,
+                    SUM(damage)                                                  AS damage,
+                    SUM(enemies5k)                                               AS aces,
+                    SUM(enemies4k)                                               AS quads,
+                    SUM(enemies3k)                                               AS triples,
+                    SUM(v1_wins)                                                 AS clutch_wins,
+                    SUM(entry_wins)                                              AS entry_wins,
+                    ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2)                   AS kd,
+                    ROUND(SUM(head_shot_kills)/NULLIF(SUM(kills),0)*100,1)      AS hs_pct,
+                    ROUND(SUM(damage)/NULLIF(
+                        COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0)/30,1)   AS adr
+                FROM {MATCHZY_TABLES['players']}
+                WHERE steamid64 != '0' AND steamid64 IS NOT NULL
+                  AND name != '' AND name IS NOT NULL
+                GROUP BY steamid64
+                ORDER BY kills DESC
+            """)
+            rows = c.fetchall()
+            c.close()
         # Normalise any SteamID32 → SteamID64 in output (DB may store either form)
         for r in rows:
             if r.get('steamid64'):
@@ -1339,38 +1475,39 @@ async def handle_api_leaderboard(request):
         return _json_response({"error": str(e)})
 
 
-async def handle_api_specialists(request):
+@_blocking_handler
+def handle_api_specialists(request):
     """GET /api/specialists — specialist stat boards from matchzy_stats_players only"""
     try:
         cached = _cache_get('specialists')
         if cached is not None:
             return _json_response(cached, max_age=60)
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        c.execute(f"""
-            SELECT
-                steamid64,
-                SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
-                COUNT(DISTINCT matchid)                                         AS matches,
-                SUM(v1_wins)                                                    AS clutch_1v1,
-                SUM(v2_wins)                                                    AS clutch_1v2,
-                SUM(v1_wins) + SUM(v2_wins)                                    AS clutch_total,
-                SUM(entry_wins)                                                 AS entry_wins,
-                SUM(entry_count)                                                AS entry_attempts,
-                ROUND(SUM(entry_wins)/NULLIF(SUM(entry_count),0)*100,1)       AS entry_rate,
-                SUM(flash_successes)                                            AS flash_successes,
-                ROUND(SUM(flash_successes)/NULLIF(COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0),1) AS flashes_per_map,
-                SUM(utility_damage)                                             AS utility_damage,
-                ROUND(SUM(utility_damage)/NULLIF(COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0),1) AS util_dmg_per_map
-            FROM {MATCHZY_TABLES['players']}
-            WHERE steamid64 != '0' AND steamid64 IS NOT NULL
-              AND name != '' AND name IS NOT NULL
-            GROUP BY steamid64
-            HAVING matches >= 1
-            ORDER BY clutch_total DESC
-        """)
-        rows = c.fetchall()
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute(f"""
+                SELECT
+                    steamid64,
+                    SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
+                    COUNT(DISTINCT matchid)                                         AS matches,
+                    SUM(v1_wins)                                                    AS clutch_1v1,
+                    SUM(v2_wins)                                                    AS clutch_1v2,
+                    SUM(v1_wins) + SUM(v2_wins)                                    AS clutch_total,
+                    SUM(entry_wins)                                                 AS entry_wins,
+                    SUM(entry_count)                                                AS entry_attempts,
+                    ROUND(SUM(entry_wins)/NULLIF(SUM(entry_count),0)*100,1)       AS entry_rate,
+                    SUM(flash_successes)                                            AS flash_successes,
+                    ROUND(SUM(flash_successes)/NULLIF(COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0),1) AS flashes_per_map,
+                    SUM(utility_damage)                                             AS utility_damage,
+                    ROUND(SUM(utility_damage)/NULLIF(COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0),1) AS util_dmg_per_map
+                FROM {MATCHZY_TABLES['players']}
+                WHERE steamid64 != '0' AND steamid64 IS NOT NULL
+                  AND name != '' AND name IS NOT NULL
+                GROUP BY steamid64
+                HAVING matches >= 1
+                ORDER BY clutch_total DESC
+            """)
+            rows = c.fetchall()
+            c.close()
         for r in rows:
             if r.get('steamid64'):
                 r['steamid64'] = to_steamid64(str(r['steamid64']))
@@ -1411,10 +1548,12 @@ def sid_variants(raw: str) -> tuple[str, str]:
     except (ValueError, TypeError):
         return raw, raw
 
-# ── Steam avatar local cache ─────────────────────────────────────────────────
-# In-memory cache: steamid64 -> local URL or Steam CDN URL
-
-
+# ── Steam profile cache ──────────────────────────────────────────────────────
+# In-memory LRU: steamid64 -> (fetched_at, profile dict). Profiles/avatars
+# rarely change, so one Steam API call per player per hour is plenty.
+_STEAM_PROFILE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_STEAM_PROFILE_TTL = 3600
+_STEAM_PROFILE_MAX = 1024
 
 async def handle_api_steam(request):
     """GET /api/steam/{steamid64} — fetch Steam profile and avatar from CDN."""
@@ -1423,20 +1562,19 @@ async def handle_api_steam(request):
         return _json_response({"error": "Steam API not configured"})
     try:
         steamid64 = to_steamid64(steamid)
-        loop = asyncio.get_running_loop()
-
-        def fetch():
-            url = (
-                f"https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
-                f"?key={STEAM_API_KEY}&steamids={steamid64}"
-            )
-            r = requests.get(url, timeout=8)
+        cached = _lru_get(_STEAM_PROFILE_CACHE, steamid64, _STEAM_PROFILE_TTL)
+        if cached is not None:
+            return _json_response(cached, max_age=3600)
+        url = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
+        params = {"key": STEAM_API_KEY, "steamids": steamid64}
+        async with _get_http_session().get(url, params=params,
+                                           timeout=aiohttp.ClientTimeout(total=8)) as r:
             r.raise_for_status()
-            players = r.json().get("response", {}).get("players", [])
-            if not players:
-                return {}
+            payload = _json_loads(await r.read())
+        players = payload.get("response", {}).get("players", [])
+        if players:
             p = players[0]
-            return {
+            data = {
                 "steamid":     p.get("steamid"),
                 "name":        p.get("personaname"),
                 "avatar":      p.get("avatarfull"),
@@ -1444,43 +1582,47 @@ async def handle_api_steam(request):
                 "country":     p.get("loccountrycode", ""),
                 "real_name":   p.get("realname", ""),
             }
-
-        data = await loop.run_in_executor(None, fetch)
+        else:
+            # Wrong or not-yet-indexed SteamID: don't pin the miss for an hour
+            return _json_response({})
+        _lru_set(_STEAM_PROFILE_CACHE, steamid64, data, _STEAM_PROFILE_MAX)
         return _json_response(data, max_age=3600)
     except Exception as e:
         return _json_response({"error": str(e)})
 
-async def handle_api_mapstats(request):
+@_blocking_handler
+def handle_api_mapstats(request):
     """GET /api/mapstats — win rates and avg scores per map"""
     try:
         cached = _cache_get('mapstats')
         if cached is not None:
             return _json_response(cached, max_age=60)
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        c.execute(f"""
-            SELECT
-                mp.mapname,
-                COUNT(*)                                            AS total_matches,
-                ROUND(AVG(mp.team1_score + mp.team2_score), 1)    AS avg_rounds,
-                ROUND(AVG(mp.team1_score), 1)                     AS avg_t1_score,
-                ROUND(AVG(mp.team2_score), 1)                     AS avg_t2_score,
-                MAX(mp.team1_score + mp.team2_score)              AS max_rounds,
-                SUM(CASE WHEN mp.team1_score > mp.team2_score THEN 1 ELSE 0 END) AS t1_wins,
-                SUM(CASE WHEN mp.team2_score > mp.team1_score THEN 1 ELSE 0 END) AS t2_wins
-            FROM {MATCHZY_TABLES['maps']} mp
-            WHERE mp.mapname IS NOT NULL AND mp.mapname != ''
-            GROUP BY mp.mapname
-            ORDER BY total_matches DESC
-        """)
-        rows = c.fetchall()
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute(f"""
+                SELECT
+                    mp.mapname,
+                    COUNT(*)                                            AS total_matches,
+                    ROUND(AVG(mp.team1_score + mp.team2_score), 1)    AS avg_rounds,
+                    ROUND(AVG(mp.team1_score), 1)                     AS avg_t1_score,
+                    ROUND(AVG(mp.team2_score), 1)                     AS avg_t2_score,
+                    MAX(mp.team1_score + mp.team2_score)              AS max_rounds,
+                    SUM(CASE WHEN mp.team1_score > mp.team2_score THEN 1 ELSE 0 END) AS t1_wins,
+                    SUM(CASE WHEN mp.team2_score > mp.team1_score THEN 1 ELSE 0 END) AS t2_wins
+                FROM {MATCHZY_TABLES['maps']} mp
+                WHERE mp.mapname IS NOT NULL AND mp.mapname != ''
+                GROUP BY mp.mapname
+                ORDER BY total_matches DESC
+            """)
+            rows = c.fetchall()
+            c.close()
         _cache_set('mapstats', rows)
         return _json_response(rows, max_age=60)
     except Exception as e:
         return _json_response({"error": str(e)})
 
-async def handle_api_h2h(request):
+@_blocking_handler
+def handle_api_h2h(request):
     """GET /api/h2h?p1=name&p2=name — head to head career stats from matchzy_stats_players only"""
     p1 = request.rel_url.query.get('p1', '')
     p2 = request.rel_url.query.get('p2', '')
@@ -1489,52 +1631,52 @@ async def handle_api_h2h(request):
 
     r1 = r2 = None
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        name_map = _edited_name_map()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            name_map = _edited_name_map()
 
-        def fetch_player(pname):
-            # Resolve SID: edit map first, then any stored name row
-            psid = next((s for s, n in name_map.items() if n == pname), None)
-            if not psid:
-                c.execute(f"SELECT steamid64 FROM {MATCHZY_TABLES['players']} WHERE name = %s AND steamid64 != '0' LIMIT 1", (pname,))
-                r = c.fetchone()
-                if r:
-                    psid = to_steamid64(str(r['steamid64']))
-            if not psid:
-                return None
-            # Aggregate ALL rows for this SID. GROUP BY required for ONLY_FULL_GROUP_BY.
-            c.execute(f"""
-                SELECT
-                    steamid64,
-                    SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
-                    COUNT(DISTINCT matchid)                                      AS matches,
-                    SUM(kills)                                                   AS kills,
-                    SUM(deaths)                                                  AS deaths,
-                    SUM(assists)                                                 AS assists,
-                    SUM(head_shot_kills)                                         AS headshots,
-                    SUM(damage)                                                  AS damage,
-                    SUM(enemies5k)                                               AS aces,
-                    SUM(enemies4k)                                               AS quads,
-                    SUM(v1_wins)                                                 AS clutch_wins,
-                    SUM(entry_wins)                                              AS entry_wins,
-                    ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2)                   AS kd,
-                    ROUND(SUM(head_shot_kills)/NULLIF(SUM(kills),0)*100,1)      AS hs_pct,
-                    ROUND(SUM(damage)/NULLIF(
-                        COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0)/30,1)  AS adr
-                FROM {MATCHZY_TABLES['players']}
-                WHERE CAST(steamid64 AS UNSIGNED) IN (%s, %s) AND steamid64 != '0'
-                GROUP BY steamid64
-            """, (int(sid_variants(psid)[0]), int(sid_variants(psid)[1])))
-            row = c.fetchone()
-            if row:
-                row = dict(row)
-                row['steamid64'] = to_steamid64(str(psid))
-            return row
+            def fetch_player(pname):
+                # Resolve SID: edit map first, then any stored name row
+                psid = next((s for s, n in name_map.items() if n == pname), None)
+                if not psid:
+                    c.execute(f"SELECT steamid64 FROM {MATCHZY_TABLES['players']} WHERE name = %s AND steamid64 != '0' LIMIT 1", (pname,))
+                    r = c.fetchone()
+                    if r:
+                        psid = to_steamid64(str(r['steamid64']))
+                if not psid:
+                    return None
+                # Aggregate ALL rows for this SID. GROUP BY required for ONLY_FULL_GROUP_BY.
+                c.execute(f"""
+                    SELECT
+                        steamid64,
+                        SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
+                        COUNT(DISTINCT matchid)                                      AS matches,
+                        SUM(kills)                                                   AS kills,
+                        SUM(deaths)                                                  AS deaths,
+                        SUM(assists)                                                 AS assists,
+                        SUM(head_shot_kills)                                         AS headshots,
+                        SUM(damage)                                                  AS damage,
+                        SUM(enemies5k)                                               AS aces,
+                        SUM(enemies4k)                                               AS quads,
+                        SUM(v1_wins)                                                 AS clutch_wins,
+                        SUM(entry_wins)                                              AS entry_wins,
+                        ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2)                   AS kd,
+                        ROUND(SUM(head_shot_kills)/NULLIF(SUM(kills),0)*100,1)      AS hs_pct,
+                        ROUND(SUM(damage)/NULLIF(
+                            COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0)/30,1)  AS adr
+                    FROM {MATCHZY_TABLES['players']}
+                    WHERE CAST(steamid64 AS UNSIGNED) IN (%s, %s) AND steamid64 != '0'
+                    GROUP BY steamid64
+                """, (int(sid_variants(psid)[0]), int(sid_variants(psid)[1])))
+                row = c.fetchone()
+                if row:
+                    row = dict(row)
+                    row['steamid64'] = to_steamid64(str(psid))
+                return row
 
-        r1 = fetch_player(p1)
-        r2 = fetch_player(p2)
-        c.close(); conn.close()
+            r1 = fetch_player(p1)
+            r2 = fetch_player(p2)
+            c.close()
 
         # Patch edited names
         for r in [r1, r2]:
@@ -1551,15 +1693,7 @@ async def handle_api_h2h(request):
 async def handle_api_status(request):
     """GET /api/status — live CS2 server status via a2s"""
     try:
-        loop = asyncio.get_running_loop()
-        addr = (SERVER_IP, SERVER_PORT)
-        info = await loop.run_in_executor(None, a2s.info, addr)
-        try:
-            a2s_players = await asyncio.wait_for(
-                loop.run_in_executor(None, a2s.players, addr), 5
-            )
-        except Exception:
-            a2s_players = []
+        info, a2s_players = await query_server()
 
         # Build player list
         player_list = []
@@ -1574,7 +1708,7 @@ async def handle_api_status(request):
                     })
         else:
             # fallback to rcon
-            rcon_players = rcon_list_players()
+            rcon_players = await rcon_list_players()
             for p in rcon_players:
                 player_list.append({"name": p.get("name",""), "score": 0, "duration": 0})
 
@@ -1599,8 +1733,11 @@ async def handle_api_status(request):
         })
 
 async def handle_stats_page(request):
-    """GET /stats — serve stats.html as a static file"""
-    return web.FileResponse(HTML_PATH)
+    """GET /stats — serve stats.html (cached in memory)"""
+    try:
+        return await _page_response(request, HTML_PATH)
+    except FileNotFoundError:
+        raise web.HTTPNotFound()
 
 # ─────────────────────────────────────────────────────────────────────────────
 # MATCH EDIT API ENDPOINTS
@@ -1656,16 +1793,18 @@ async def handle_api_save_match(request):
         return _json_response({"ok": False, "error": str(e)})
 
 
-async def handle_api_get_edits(request):
+@_blocking_handler
+def handle_api_get_edits(request):
     """GET /api/match/{matchid}/edits — return stored edits for a match."""
     matchid = request.match_info.get('matchid', '')
     edits   = _get_edits(matchid)
     has_raw = False
     try:
-        conn = get_db(); c = conn.cursor()
-        c.execute("SELECT 1 FROM fshost_matches WHERE matchid = %s", (str(matchid),))
-        has_raw = c.fetchone() is not None
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor()
+            c.execute("SELECT 1 FROM fshost_matches WHERE matchid = %s", (str(matchid),))
+            has_raw = c.fetchone() is not None
+            c.close()
     except Exception:
         pass
     return _json_response({"matchid": matchid, "edits": edits, "has_raw": has_raw})
@@ -1685,20 +1824,22 @@ async def handle_api_patch_match(request):
         edits = body.get('edits')
         if not isinstance(edits, dict):
             return _json_response({"ok": False, "error": "Missing 'edits' object"})
-        conn = get_db(); c = conn.cursor()
-        c.execute("""
-            INSERT INTO match_edits (matchid, edits_json, edited_at)
-            VALUES (%s, %s, NOW())
-            ON DUPLICATE KEY UPDATE edits_json = VALUES(edits_json), edited_at = NOW()
-        """, (str(matchid), json.dumps(edits, default=str)))
-        conn.commit(); c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor()
+            c.execute("""
+                INSERT INTO match_edits (matchid, edits_json, edited_at)
+                VALUES (%s, %s, NOW())
+                ON DUPLICATE KEY UPDATE edits_json = VALUES(edits_json), edited_at = NOW()
+            """, (str(matchid), json.dumps(edits, default=str)))
+            conn.commit(); c.close()
         _bust_edits_cache()
         return _json_response({"ok": True, "matchid": matchid})
     except Exception as e:
         return _json_response({"ok": False, "error": str(e)})
 
 
-async def handle_api_revert_match(request):
+@_blocking_handler
+def handle_api_revert_match(request):
     """DELETE /api/match/{matchid}/edit — remove edits, revert to fshost data."""
     matchid = request.match_info.get('matchid', '')
     if not _verify_edit_token(request):
@@ -1708,9 +1849,10 @@ async def handle_api_revert_match(request):
             headers={"Access-Control-Allow-Origin": "*"},
         )
     try:
-        conn = get_db(); c = conn.cursor()
-        c.execute("DELETE FROM match_edits WHERE matchid = %s", (str(matchid),))
-        conn.commit(); c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor()
+            c.execute("DELETE FROM match_edits WHERE matchid = %s", (str(matchid),))
+            conn.commit(); c.close()
         _bust_edits_cache()
         return _json_response({"ok": True, "matchid": matchid, "reverted": True})
     except Exception as e:
@@ -1718,26 +1860,27 @@ async def handle_api_revert_match(request):
 
 
 
-async def handle_api_team_h2h(request):
+@_blocking_handler
+def handle_api_team_h2h(request):
     """GET /api/teamh2h?t1=name&t2=name — head-to-head history between two teams"""
     t1 = request.rel_url.query.get('t1', '').strip()
     t2 = request.rel_url.query.get('t2', '').strip()
     if not t1 or not t2:
         return _json_response({"error": "Need t1 and t2 query params"})
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        c.execute(f"""
-            SELECT mm.matchid, mm.team1_name, mm.team2_name, mm.winner,
-                   m.mapname, m.team1_score, m.team2_score, mm.end_time
-            FROM {MATCHZY_TABLES['matches']} mm
-            LEFT JOIN {MATCHZY_TABLES['maps']} m ON mm.matchid = m.matchid
-            WHERE (LOWER(mm.team1_name) = LOWER(%s) AND LOWER(mm.team2_name) = LOWER(%s))
-               OR (LOWER(mm.team1_name) = LOWER(%s) AND LOWER(mm.team2_name) = LOWER(%s))
-            ORDER BY mm.matchid DESC
-        """, (t1, t2, t2, t1))
-        rows = [dict(r) for r in c.fetchall()]
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute(f"""
+                SELECT mm.matchid, mm.team1_name, mm.team2_name, mm.winner,
+                       m.mapname, m.team1_score, m.team2_score, mm.end_time
+                FROM {MATCHZY_TABLES['matches']} mm
+                LEFT JOIN {MATCHZY_TABLES['maps']} m ON mm.matchid = m.matchid
+                WHERE (LOWER(mm.team1_name) = LOWER(%s) AND LOWER(mm.team2_name) = LOWER(%s))
+                   OR (LOWER(mm.team1_name) = LOWER(%s) AND LOWER(mm.team2_name) = LOWER(%s))
+                ORDER BY mm.matchid DESC
+            """, (t1, t2, t2, t1))
+            rows = [dict(r) for r in c.fetchall()]
+            c.close()
         all_edits = _get_all_edits()
         for r in rows:
             mid = str(r['matchid'])
@@ -1758,82 +1901,84 @@ async def handle_api_team_h2h(request):
         return _json_response({"error": str(e)})
 
 
-async def handle_api_teams(request):
+@_blocking_handler
+def handle_api_teams(request):
     """GET /api/teams — distinct team names from matches table"""
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        c.execute(f"""
-            SELECT DISTINCT team1_name AS name FROM {MATCHZY_TABLES['matches']}
-            WHERE team1_name IS NOT NULL AND team1_name != ''
-            UNION
-            SELECT DISTINCT team2_name AS name FROM {MATCHZY_TABLES['matches']}
-            WHERE team2_name IS NOT NULL AND team2_name != ''
-            ORDER BY name
-        """)
-        rows = [r['name'] for r in c.fetchall()]
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute(f"""
+                SELECT DISTINCT team1_name AS name FROM {MATCHZY_TABLES['matches']}
+                WHERE team1_name IS NOT NULL AND team1_name != ''
+                UNION
+                SELECT DISTINCT team2_name AS name FROM {MATCHZY_TABLES['matches']}
+                WHERE team2_name IS NOT NULL AND team2_name != ''
+                ORDER BY name
+            """)
+            rows = [r['name'] for r in c.fetchall()]
+            c.close()
         return _json_response(rows)
     except Exception as e:
         return _json_response({"error": str(e)})
 
 
-async def handle_api_search(request):
+@_blocking_handler
+def handle_api_search(request):
     """GET /api/search?q=query — search players and matches"""
     q = request.rel_url.query.get('q', '').strip()
     if not q or len(q) < 2:
         return _json_response({"players": [], "matches": []})
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        like = f"%{q}%"
-        c.execute(f"""
-            SELECT steamid64,
-                SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
-                COUNT(DISTINCT matchid) AS matches,
-                ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2) AS kd,
-                ROUND(SUM(damage)/NULLIF(COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0)/30,1) AS adr
-            FROM {MATCHZY_TABLES['players']}
-            WHERE name LIKE %s AND steamid64 != '0'
-            GROUP BY steamid64
-            ORDER BY matches DESC
-            LIMIT 8
-        """, (like,))
-        players = [dict(r) for r in c.fetchall()]
-        # Normalise SteamID32 → SteamID64 in output
-        for p in players:
-            if p.get('steamid64'):
-                p['steamid64'] = to_steamid64(str(p['steamid64']))
-        name_map = _edited_name_map()
-        for p in players:
-            sid = str(p.get('steamid64') or '')
-            if sid in name_map:
-                p['name'] = name_map[sid]
-        for sid, edited_name in [(s, n) for s, n in name_map.items() if q.lower() in n.lower()]:
-            sid64_cmp = to_steamid64(str(sid))
-            if not any(to_steamid64(str(p.get('steamid64',''))) == sid64_cmp for p in players):
-                c.execute(f"""
-                    SELECT steamid64, COUNT(DISTINCT matchid) AS matches,
-                        ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2) AS kd,
-                        ROUND(SUM(damage)/NULLIF(COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0)/30,1) AS adr
-                    FROM {MATCHZY_TABLES['players']} WHERE CAST(steamid64 AS UNSIGNED) IN (%s, %s)
-                    GROUP BY steamid64 LIMIT 1
-                """, (int(sid_variants(sid)[0]), int(sid_variants(sid)[1])))
-                row = c.fetchone()
-                if row:
-                    row = dict(row); row['name'] = edited_name; players.append(row)
-        c.execute(f"""
-            SELECT mm.matchid, mm.team1_name, mm.team2_name, mm.winner, mm.end_time,
-                   m.mapname, m.team1_score, m.team2_score
-            FROM {MATCHZY_TABLES['matches']} mm
-            LEFT JOIN {MATCHZY_TABLES['maps']} m ON mm.matchid = m.matchid
-            WHERE mm.team1_name LIKE %s OR mm.team2_name LIKE %s
-               OR CAST(mm.matchid AS CHAR) LIKE %s
-            ORDER BY mm.matchid DESC
-            LIMIT 8
-        """, (like, like, like))
-        matches = [dict(r) for r in c.fetchall()]
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            like = f"%{q}%"
+            c.execute(f"""
+                SELECT steamid64,
+                    SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS name,
+                    COUNT(DISTINCT matchid) AS matches,
+                    ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2) AS kd,
+                    ROUND(SUM(damage)/NULLIF(COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0)/30,1) AS adr
+                FROM {MATCHZY_TABLES['players']}
+                WHERE name LIKE %s AND steamid64 != '0'
+                GROUP BY steamid64
+                ORDER BY matches DESC
+                LIMIT 8
+            """, (like,))
+            players = [dict(r) for r in c.fetchall()]
+            # Normalise SteamID32 → SteamID64 in output
+            for p in players:
+                if p.get('steamid64'):
+                    p['steamid64'] = to_steamid64(str(p['steamid64']))
+            name_map = _edited_name_map()
+            for p in players:
+                sid = str(p.get('steamid64') or '')
+                if sid in name_map:
+                    p['name'] = name_map[sid]
+            for sid, edited_name in [(s, n) for s, n in name_map.items() if q.lower() in n.lower()]:
+                sid64_cmp = to_steamid64(str(sid))
+                if not any(to_steamid64(str(p.get('steamid64',''))) == sid64_cmp for p in players):
+                    c.execute(f"""
+                        SELECT steamid64, COUNT(DISTINCT matchid) AS matches,
+                            ROUND(SUM(kills)/NULLIF(SUM(deaths),0),2) AS kd,
+                            ROUND(SUM(damage)/NULLIF(COUNT(DISTINCT CONCAT(matchid,'_',mapnumber)),0)/30,1) AS adr
+                        FROM {MATCHZY_TABLES['players']} WHERE CAST(steamid64 AS UNSIGNED) IN (%s, %s)
+                        GROUP BY steamid64 LIMIT 1
+                    """, (int(sid_variants(sid)[0]), int(sid_variants(sid)[1])))
+                    row = c.fetchone()
+                    if row:
+                        row = dict(row); row['name'] = edited_name; players.append(row)
+            c.execute(f"""
+                SELECT mm.matchid, mm.team1_name, mm.team2_name, mm.winner, mm.end_time,
+                       m.mapname, m.team1_score, m.team2_score
+                FROM {MATCHZY_TABLES['matches']} mm
+                LEFT JOIN {MATCHZY_TABLES['maps']} m ON mm.matchid = m.matchid
+                WHERE mm.team1_name LIKE %s OR mm.team2_name LIKE %s
+                   OR CAST(mm.matchid AS CHAR) LIKE %s
+                ORDER BY mm.matchid DESC
+                LIMIT 8
+            """, (like, like, like))
+            matches = [dict(r) for r in c.fetchall()]
+            c.close()
         all_edits = _get_all_edits()
         for r in matches:
             mid = str(r['matchid'])
@@ -1849,42 +1994,43 @@ async def handle_api_search(request):
         return _json_response({"error": str(e)})
 
 
-async def handle_api_player_mapstats(request):
+@_blocking_handler
+def handle_api_player_mapstats(request):
     """GET /api/player/{name}/mapstats — per-map career breakdown for a player"""
     name = request.match_info.get('name', '')
     try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-        # Resolve SID via edit map first (handles renamed players), then by any stored name
-        name_map = _edited_name_map()
-        sid = next((s for s, n in name_map.items() if n == name), None)
-        if not sid:
-            c.execute(f"SELECT steamid64 FROM {MATCHZY_TABLES['players']} WHERE name = %s AND steamid64 != '0' LIMIT 1", (name,))
-            row = c.fetchone()
-            if row:
-                sid = to_steamid64(str(row['steamid64']))
-        if not sid:
-            return _json_response([])
-        c.execute(f"""
-            SELECT m.mapname,
-                COUNT(DISTINCT p.matchid)                                           AS matches,
-                SUM(p.kills) AS kills, SUM(p.deaths) AS deaths,
-                SUM(p.assists) AS assists, SUM(p.damage) AS damage,
-                SUM(p.head_shot_kills) AS headshots,
-                ROUND(SUM(p.kills)/NULLIF(SUM(p.deaths),0),2)                      AS kd,
-                ROUND(SUM(p.head_shot_kills)/NULLIF(SUM(p.kills),0)*100,1)         AS hs_pct,
-                ROUND(SUM(p.damage)/NULLIF(COUNT(DISTINCT p.matchid),0)/30,1)      AS adr,
-                SUM(CASE WHEN LOWER(mm.winner) = LOWER(p.team) THEN 1 ELSE 0 END) AS wins
-            FROM {MATCHZY_TABLES['players']} p
-            LEFT JOIN {MATCHZY_TABLES['maps']} m  ON p.matchid=m.matchid AND p.mapnumber=m.mapnumber
-            LEFT JOIN {MATCHZY_TABLES['matches']} mm ON p.matchid=mm.matchid
-            WHERE CAST(p.steamid64 AS UNSIGNED) IN (%s, %s) AND p.steamid64 != '0'
-              AND m.mapname IS NOT NULL AND m.mapname != ''
-            GROUP BY m.mapname
-            ORDER BY matches DESC
-        """, (int(sid_variants(sid)[0]), int(sid_variants(sid)[1])))
-        rows = [dict(r) for r in c.fetchall()]
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            # Resolve SID via edit map first (handles renamed players), then by any stored name
+            name_map = _edited_name_map()
+            sid = next((s for s, n in name_map.items() if n == name), None)
+            if not sid:
+                c.execute(f"SELECT steamid64 FROM {MATCHZY_TABLES['players']} WHERE name = %s AND steamid64 != '0' LIMIT 1", (name,))
+                row = c.fetchone()
+                if row:
+                    sid = to_steamid64(str(row['steamid64']))
+            if not sid:
+                return _json_response([])
+            c.execute(f"""
+                SELECT m.mapname,
+                    COUNT(DISTINCT p.matchid)                                           AS matches,
+                    SUM(p.kills) AS kills, SUM(p.deaths) AS deaths,
+                    SUM(p.assists) AS assists, SUM(p.damage) AS damage,
+                    SUM(p.head_shot_kills) AS headshots,
+                    ROUND(SUM(p.kills)/NULLIF(SUM(p.deaths),0),2)                      AS kd,
+                    ROUND(SUM(p.head_shot_kills)/NULLIF(SUM(p.kills),0)*100,1)         AS hs_pct,
+                    ROUND(SUM(p.damage)/NULLIF(COUNT(DISTINCT p.matchid),0)/30,1)      AS adr,
+                    SUM(CASE WHEN LOWER(mm.winner) = LOWER(p.team) THEN 1 ELSE 0 END) AS wins
+                FROM {MATCHZY_TABLES['players']} p
+                LEFT JOIN {MATCHZY_TABLES['maps']} m  ON p.matchid=m.matchid AND p.mapnumber=m.mapnumber
+                LEFT JOIN {MATCHZY_TABLES['matches']} mm ON p.matchid=mm.matchid
+                WHERE CAST(p.steamid64 AS UNSIGNED) IN (%s, %s) AND p.steamid64 != '0'
+                  AND m.mapname IS NOT NULL AND m.mapname != ''
+                GROUP BY m.mapname
+                ORDER BY matches DESC
+            """, (int(sid_variants(sid)[0]), int(sid_variants(sid)[1])))
+            rows = [dict(r) for r in c.fetchall()]
+            c.close()
         return _json_response(rows)
     except Exception as e:
         return _json_response({"error": str(e)})
@@ -1907,17 +2053,17 @@ def _get_steam_openid_url(return_to: str) -> str:
     }
     return "https://steamcommunity.com/openid/login?" + urllib.parse.urlencode(params)
 
-def _verify_steam_openid(params: dict, return_to: str) -> str | None:
+async def _verify_steam_openid(params: dict, return_to: str) -> str | None:
     """Verify Steam OpenID response. Returns steamid64 or None."""
-    import urllib.parse, re
+    import re
     check_params = dict(params)
     check_params["openid.mode"] = "check_authentication"
-    body = urllib.parse.urlencode(check_params).encode()
     try:
-        r = requests.post("https://steamcommunity.com/openid/login",
-                          data=body, timeout=10,
-                          headers={"Content-Type": "application/x-www-form-urlencoded"})
-        if "is_valid:true" not in r.text:
+        async with _get_http_session().post("https://steamcommunity.com/openid/login",
+                                            data=check_params,
+                                            timeout=aiohttp.ClientTimeout(total=10)) as r:
+            text = await r.text()
+        if "is_valid:true" not in text:
             return None
         identity = params.get("openid.claimed_id", "")
         m = re.search(r"https://steamcommunity\.com/openid/id/(\d+)", identity)
@@ -1926,10 +2072,11 @@ def _verify_steam_openid(params: dict, return_to: str) -> str | None:
         return None
 
 async def handle_admin_page(request):
-    """GET /admin — serve admin.html"""
-    if ADMIN_HTML_PATH.exists():
-        return web.FileResponse(ADMIN_HTML_PATH)
-    return web.Response(text="Admin panel not found", status=404)
+    """GET /admin — serve admin.html (cached in memory)"""
+    try:
+        return await _page_response(request, ADMIN_HTML_PATH)
+    except FileNotFoundError:
+        return web.Response(text="Admin panel not found", status=404)
 
 async def handle_admin_steam_login(request):
     """GET /auth/steam — redirect to Steam OpenID."""
@@ -1945,9 +2092,7 @@ async def handle_admin_steam_callback(request):
     host   = request.headers.get("X-Forwarded-Host", request.host)
     return_to = f"{scheme}://{host}/auth/steam/callback"
     params = dict(request.rel_url.query)
-    steamid = await asyncio.get_running_loop().run_in_executor(
-        None, _verify_steam_openid, params, return_to
-    )
+    steamid = await _verify_steam_openid(params, return_to)
     if not steamid:
         raise web.HTTPFound(location="/admin?error=auth_failed")
     if str(ADMIN_ID) and steamid != str(ADMIN_ID):
@@ -1978,61 +2123,67 @@ async def handle_admin_api_me(request):
         return web.Response(text=json.dumps({"ok": False}), content_type="application/json", status=401)
     return _json_response({"ok": True, "steamid": sid})
 
-async def handle_admin_api_matches(request):
+@_blocking_handler
+def handle_admin_api_matches(request):
     """GET /api/admin/matches — all matches for admin management."""
     if not _get_admin_steamid(request):
         return web.Response(text=json.dumps({"error": "Unauthorized"}), content_type="application/json", status=401)
     try:
-        conn = get_db(); c = conn.cursor(dictionary=True)
-        c.execute("""
-            SELECT f.matchid, f.fetched_at,
-                   JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.map'))        AS map,
-                   JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.winner'))     AS winner,
-                   JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.team1.name')) AS team1,
-                   JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.team2.name')) AS team2,
-                   JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.team1.score')) AS score1,
-                   JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.team2.score')) AS score2,
-                   e.edited_at
-            FROM fshost_matches f
-            LEFT JOIN match_edits e ON e.matchid = f.matchid
-            ORDER BY f.fetched_at DESC
-        """)
-        rows = [dict(r) for r in c.fetchall()]
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute("""
+                SELECT f.matchid, f.fetched_at,
+                       JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.map'))        AS map,
+                       JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.winner'))     AS winner,
+                       JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.team1.name')) AS team1,
+                       JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.team2.name')) AS team2,
+                       JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.team1.score')) AS score1,
+                       JSON_UNQUOTE(JSON_EXTRACT(f.raw_json, '$.team2.score')) AS score2,
+                       e.edited_at
+                FROM fshost_matches f
+                LEFT JOIN match_edits e ON e.matchid = f.matchid
+                ORDER BY f.fetched_at DESC
+            """)
+            rows = [dict(r) for r in c.fetchall()]
+            c.close()
         return _json_response(rows)
     except Exception as e:
         return _json_response({"error": str(e)})
 
-async def handle_admin_api_delete_match(request):
+@_blocking_handler
+def handle_admin_api_delete_match(request):
     """DELETE /api/admin/match/{matchid} — delete match entirely."""
     if not _get_admin_steamid(request):
         return web.Response(text=json.dumps({"error": "Unauthorized"}), content_type="application/json", status=401)
     matchid = request.match_info.get("matchid", "")
     try:
-        conn = get_db(); c = conn.cursor()
-        c.execute("DELETE FROM match_edits WHERE matchid = %s", (matchid,))
-        c.execute("DELETE FROM fshost_matches WHERE matchid = %s", (matchid,))
-        conn.commit(); c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor()
+            c.execute("DELETE FROM match_edits WHERE matchid = %s", (matchid,))
+            c.execute("DELETE FROM fshost_matches WHERE matchid = %s", (matchid,))
+            conn.commit(); c.close()
         return _json_response({"ok": True})
     except Exception as e:
         return _json_response({"error": str(e)})
 
-async def handle_admin_api_players(request):
+@_blocking_handler
+def handle_admin_api_players(request):
     """GET /api/admin/players — all players for management."""
     if not _get_admin_steamid(request):
         return web.Response(text=json.dumps({"error": "Unauthorized"}), content_type="application/json", status=401)
     try:
-        conn = get_db(); c = conn.cursor(dictionary=True)
-        c.execute("""
-            SELECT steamid64, name,
-                   COUNT(*) AS matches,
-                   SUM(kills) AS kills, SUM(deaths) AS deaths
-            FROM matchzy_stats_players
-            GROUP BY steamid64, name
-            ORDER BY matches DESC
-        """)
-        rows = [dict(r) for r in c.fetchall()]
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute("""
+                SELECT steamid64, name,
+                       COUNT(*) AS matches,
+                       SUM(kills) AS kills, SUM(deaths) AS deaths
+                FROM matchzy_stats_players
+                GROUP BY steamid64, name
+                ORDER BY matches DESC
+            """)
+            rows = [dict(r) for r in c.fetchall()]
+            c.close()
         return _json_response(rows)
     except Exception as e:
         return _json_response({"error": str(e)})
@@ -2047,10 +2198,12 @@ async def handle_admin_api_rename_player(request):
         new_name = body.get("new_name", "").strip()
         if not old_name or not new_name:
             return _json_response({"error": "old_name and new_name required"})
-        conn = get_db(); c = conn.cursor()
-        c.execute("UPDATE matchzy_stats_players SET name = %s WHERE name = %s", (new_name, old_name))
-        affected = c.rowcount
-        conn.commit(); c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor()
+            c.execute("UPDATE matchzy_stats_players SET name = %s WHERE name = %s", (new_name, old_name))
+            affected = c.rowcount
+            conn.commit(); c.close()
+        await refresh_career_summary_now()
         return _json_response({"ok": True, "rows_updated": affected})
     except Exception as e:
         return _json_response({"error": str(e)})
@@ -2060,9 +2213,8 @@ async def handle_admin_api_server(request):
     if not _get_admin_steamid(request):
         return web.Response(text=json.dumps({"error": "Unauthorized"}), content_type="application/json", status=401)
     try:
-        loop = asyncio.get_running_loop()
-        players = await loop.run_in_executor(None, rcon_list_players)
-        status_txt = await loop.run_in_executor(None, send_rcon, "status")
+        players = await rcon_list_players()
+        status_txt = await send_rcon("status")
         return _json_response({"ok": True, "players": players, "status": status_txt})
     except Exception as e:
         return _json_response({"error": str(e)})
@@ -2076,27 +2228,28 @@ async def handle_admin_api_rcon(request):
         cmd = body.get("cmd", "").strip()
         if not cmd:
             return _json_response({"error": "cmd required"})
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, send_rcon, cmd)
+        result = await send_rcon(cmd)
         return _json_response({"ok": True, "result": result})
     except Exception as e:
         return _json_response({"error": str(e)})
 
 
-async def handle_admin_api_suggest_merges(request):
+@_blocking_handler
+def handle_admin_api_suggest_merges(request):
     """GET /api/admin/players/suggest-merges — fuzzy duplicate detection."""
     if not _get_admin_steamid(request):
         return web.Response(text=json.dumps({"error": "Unauthorized"}), content_type="application/json", status=401)
     try:
-        conn = get_db(); c = conn.cursor(dictionary=True)
-        c.execute("""
-            SELECT name, COUNT(*) AS matches, SUM(kills) AS kills
-            FROM matchzy_stats_players
-            GROUP BY name
-            ORDER BY matches DESC
-        """)
-        players = [dict(r) for r in c.fetchall()]
-        c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute("""
+                SELECT name, COUNT(*) AS matches, SUM(kills) AS kills
+                FROM matchzy_stats_players
+                GROUP BY name
+                ORDER BY matches DESC
+            """)
+            players = [dict(r) for r in c.fetchall()]
+            c.close()
 
         # Fuzzy matching using simple edit distance
         def edit_distance(a, b):
@@ -2160,14 +2313,16 @@ async def handle_admin_api_merge_players(request):
         merge_names = [n.strip() for n in body.get("merge_names", []) if n.strip()]
         if not keep_name or not merge_names:
             return _json_response({"error": "keep_name and merge_names[] required"})
-        conn = get_db(); c = conn.cursor()
-        total = 0
-        for name in merge_names:
-            if name == keep_name:
-                continue
-            c.execute("UPDATE matchzy_stats_players SET name = %s WHERE name = %s", (keep_name, name))
-            total += c.rowcount
-        conn.commit(); c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor()
+            total = 0
+            for name in merge_names:
+                if name == keep_name:
+                    continue
+                c.execute("UPDATE matchzy_stats_players SET name = %s WHERE name = %s", (keep_name, name))
+                total += c.rowcount
+            conn.commit(); c.close()
+        await refresh_career_summary_now()
         return _json_response({"ok": True, "rows_updated": total, "keep_name": keep_name, "merged": merge_names})
     except Exception as e:
         return _json_response({"error": str(e)})
@@ -2194,73 +2349,72 @@ async def handle_admin_api_merge_by_steamid(request):
             pass
         target_sid = (body.get("steamid64") or "").strip() or None
 
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
-
-        # Find all steamid64s that have more than one distinct name
-        if target_sid:
-            c.execute(f"""
-                SELECT steamid64,
-                    COUNT(DISTINCT name) AS name_count,
-                    SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS latest_name
-                FROM {MATCHZY_TABLES['players']}
-                WHERE steamid64 IN (%s, %s) AND steamid64 != '0'
-                GROUP BY steamid64
-                HAVING name_count > 1
-            """, sid_variants(target_sid))
-        else:
-            c.execute(f"""
-                SELECT steamid64,
-                    COUNT(DISTINCT name) AS name_count,
-                    SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS latest_name
-                FROM {MATCHZY_TABLES['players']}
-                WHERE steamid64 != '0' AND steamid64 IS NOT NULL
-                GROUP BY steamid64
-                HAVING name_count > 1
-            """)
-
-        duplicates = [dict(r) for r in c.fetchall()]
-
-        # Apply edit-map overrides: if admin has explicitly renamed this player, use that
-        name_map = _edited_name_map()
-        total_updated = 0
-        merged = []
-
-        for dup in duplicates:
-            sid = str(dup['steamid64'])
-            canonical = name_map.get(sid) or dup['latest_name']
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
 
-            # Fetch old names for reporting
-            c.execute(f"""
-                SELECT DISTINCT name FROM {MATCHZY_TABLES['players']}
-                WHERE steamid64 IN (%s, %s) AND name != %s
-            """, (*sid_variants(sid), canonical))
-            old_names = [r['name'] for r in c.fetchall()]
-
-            # Update all rows for this SID to the canonical name (both stored forms)
-            c2 = conn.cursor()
-            c2.execute(f"""
-                UPDATE {MATCHZY_TABLES['players']}
-                SET name = %s
-                WHERE steamid64 IN (%s, %s) AND name != %s
-            """, (canonical, *sid_variants(sid), canonical))
-            rows_changed = c2.rowcount
-            c2.close()
-
-            total_updated += rows_changed
-            merged.append({
-                "steamid64":   sid,
-                "canonical":   canonical,
-                "old_names":   old_names,
-                "rows_updated": rows_changed,
-            })
+            # Find all steamid64s that have more than one distinct name
+            if target_sid:
+                c.execute(f"""
+                    SELECT steamid64,
+                        COUNT(DISTINCT name) AS name_count,
+                        SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS latest_name
+                    FROM {MATCHZY_TABLES['players']}
+                    WHERE steamid64 IN (%s, %s) AND steamid64 != '0'
+                    GROUP BY steamid64
+                    HAVING name_count > 1
+                """, sid_variants(target_sid))
+            else:
+                c.execute(f"""
+                    SELECT steamid64,
+                        COUNT(DISTINCT name) AS name_count,
+                        SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS latest_name
+                    FROM {MATCHZY_TABLES['players']}
+                    WHERE steamid64 != '0' AND steamid64 IS NOT NULL
+                    GROUP BY steamid64
+                    HAVING name_count > 1
+                """)
+
+            duplicates = [dict(r) for r in c.fetchall()]
+
+            # Apply edit-map overrides: if admin has explicitly renamed this player, use that
+            name_map = _edited_name_map()
+            total_updated = 0
+            merged = []
 
-        conn.commit()
-        c.close()
-        conn.close()
+            for dup in duplicates:
+                sid = str(dup['steamid64'])
+                canonical = name_map.get(sid) or dup['latest_name']
 
-        # Bust all caches so leaderboard/profiles reflect the fix immediately
-        _bust_edits_cache()
+                # Fetch old names for reporting
+                c.execute(f"""
+                    SELECT DISTINCT name FROM {MATCHZY_TABLES['players']}
+                    WHERE steamid64 IN (%s, %s) AND name != %s
+                """, (*sid_variants(sid), canonical))
+                old_names = [r['name'] for r in c.fetchall()]
+
+                # Update all rows for this SID to the canonical name (both stored forms)
+                c2 = conn.cursor()
+                c2.execute(f"""
+                    UPDATE {MATCHZY_TABLES['players']}
+                    SET name = %s
+                    WHERE steamid64 IN (%s, %s) AND name != %s
+                """, (canonical, *sid_variants(sid), canonical))
+                rows_changed = c2.rowcount
+                c2.close()
+
+                total_updated += rows_changed
+                merged.append({
+                    "steamid64":   sid,
+                    "canonical":   canonical,
+                    "old_names":   old_names,
+                    "rows_updated": rows_changed,
+                })
+
+            conn.commit()
+            c.close()
+
+        # Rebuild the summary and bust all caches so leaderboard/profiles reflect the fix immediately
+        await refresh_career_summary_now()
 
         return _json_response({
             "ok":            True,
@@ -2323,6 +2477,14 @@ async def start_http_server():
     app.router.add_get('/health',  handle_health_check)
     app.router.add_static('/assets', path=pathlib.Path(__file__).parent / "assets", name='assets')
 
+    # Read and gzip both pages up front so the first visitor doesn't wait on it
+    loop = asyncio.get_running_loop()
+    for page in (HTML_PATH, ADMIN_HTML_PATH):
+        try:
+            await loop.run_in_executor(None, _load_page, page)
+        except FileNotFoundError:
+            pass
+
     port = int(os.getenv('PORT', 8080))
     runner = web.AppRunner(app)
     await runner.setup()
@@ -2336,6 +2498,8 @@ STEAM_API_KEY  = os.getenv("STEAM_API_KEY", "")
 EDIT_PASSWORD  = os.getenv("EDIT_PASSWORD", "changeme")   # set in Railway env vars
 SERVER_IP = os.getenv("SERVER_IP", "127.0.0.1")
 SERVER_PORT = int(os.getenv("SERVER_PORT", 27015))
+# A2S query address; SERVER_IP is resolved to a literal IP once in on_ready
+_SERVER_ADDR = (SERVER_IP, SERVER_PORT)
 RCON_IP = os.getenv("RCON_IP", SERVER_IP)
 RCON_PORT = int(os.getenv("RCON_PORT", 27015))
 RCON_PASSWORD = os.getenv("RCON_PASSWORD", "")
@@ -2354,7 +2518,16 @@ MAP_WHITELIST = [
 intents = discord.Intents.default()
 intents.message_content = True
 intents.messages = True
-bot = commands.Bot(command_prefix="!", intents=intents, owner_id=ADMIN_ID)
+
+class CS2Bot(commands.Bot):
+    async def close(self):
+        await super().close()
+        # The shared outbound session lives as long as the bot; close it here so
+        # aiohttp doesn't warn about an unclosed session at shutdown
+        if _HTTP_SESSION is not None and not _HTTP_SESSION.closed:
+            await _HTTP_SESSION.close()
+
+bot = CS2Bot(command_prefix="!", intents=intents, owner_id=ADMIN_ID)
 
 # ========== DATABASE SETUP (Railway MySQL via mysql-connector-python) ==========
 # Railway MySQL env vars:
@@ -2386,43 +2559,138 @@ def _mysql_cfg() -> dict:
         autocommit=False,
     )
 
-_DB_CFG = _mysql_cfg()
+# Buffered cursors by default: results are read in full on execute, so a
+# caller that only fetchone()s a multi-row result can't leave unread rows
+# behind for the pool's session reset to trip over.
+_DB_CFG = dict(_mysql_cfg(), buffered=True)
+_DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 8))
+_DB_POOL = None
+_DB_POOL_LOCK = threading.Lock()
 
 def get_db():
-    """Return a new MySQL connection."""
-    return mysql.connector.connect(**_DB_CFG)
+    """Return a pooled MySQL connection; prefer `with db_conn() as conn:`.
 
-def init_database():
+    The pool is created on first use. Sessions are reset on return so a
+    connection never carries an open (autocommit=False) transaction or stale
+    snapshot into its next caller. If every pooled connection is checked out,
+    fall back to a one-off direct connection rather than failing.
+    """
+    global _DB_POOL
+    if _DB_POOL is None:
+        with _DB_POOL_LOCK:
+            if _DB_POOL is None:
+                _DB_POOL = pooling.MySQLConnectionPool(
+                    pool_name="cs2bot", pool_size=_DB_POOL_SIZE,
+                    pool_reset_session=True, **_DB_CFG,
+                )
+    try:
+        return _DB_POOL.get_connection()
+    except mysql.connector.errors.PoolError:
+        return mysql.connector.connect(**_DB_CFG)
+
+def _release_db(conn):
+    """Close a connection (returning pooled ones to the pool). A failing
+    close — e.g. the session reset on a dropped link — is logged, never
+    raised over the caller's own result or error."""
+    try:
+        conn.close()
+    except Exception as e:
+        print(f"[DB] error releasing connection: {e}")
+
+@contextlib.contextmanager
+def db_conn():
+    """get_db() as a context manager: the connection always goes back to the
+    pool, including when the block raises."""
     conn = get_db()
-    c = conn.cursor()
+    try:
+        yield conn
+    finally:
+        _release_db(conn)
 
-    # ── fshost match cache ───────────────────────────────────────────────────
+def _ensure_index(c, table: str, index: str, columns: str):
+    """CREATE INDEX once (MySQL has no IF NOT EXISTS for it); skipped while the table doesn't exist yet."""
     c.execute("""
-        CREATE TABLE IF NOT EXISTS fshost_matches (
-            matchid    VARCHAR(64) PRIMARY KEY,
-            raw_json   LONGTEXT    NOT NULL,
-            fetched_at DATETIME    NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME    NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-        ) CHARACTER SET utf8mb4
-    """)
-
-    # ── edit overlay: partial JSON diff stored per match ────────────────────
+        SELECT
+            (SELECT COUNT(*) FROM information_schema.tables
+              WHERE table_schema = DATABASE() AND table_name = %s),
+            (SELECT COUNT(*) FROM information_schema.statistics
+              WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s)
+    """, (table, table, index))
+    has_table, has_index = c.fetchone()
+    if has_table and not has_index:
+        c.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+        print(f"✓ Created index {index} on {table}")
+
+def _drop_index(c, table: str, index: str):
+    """DROP INDEX if present (MySQL has no IF EXISTS for it)."""
     c.execute("""
-        CREATE TABLE IF NOT EXISTS match_edits (
-            matchid    VARCHAR(64) PRIMARY KEY,
-            edits_json LONGTEXT    NOT NULL,
-            edited_at  DATETIME    NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-        ) CHARACTER SET utf8mb4
-    """)
-
-    # map_stats and player_stats are intentionally NOT created here.
-    # MatchZy writes matchzy_stats_maps, matchzy_stats_players, and
-    # matchzy_stats_matches to MySQL automatically when matches finish.
-    # The bot reads from those tables — it does not duplicate them.
-
-    conn.commit()
-    c.close()
-    conn.close()
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, index))
+    if c.fetchone()[0]:
+        c.execute(f"DROP INDEX {index} ON {table}")
+        print(f"✓ Dropped index {index} on {table}")
+
+def init_database():
+    with db_conn() as conn:
+        c = conn.cursor()
+
+        # ── fshost match cache ───────────────────────────────────────────────────
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS fshost_matches (
+                matchid    VARCHAR(64) PRIMARY KEY,
+                raw_json   LONGTEXT    NOT NULL,
+                fetched_at DATETIME    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME    NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) CHARACTER SET utf8mb4
+        """)
+
+        # ── edit overlay: partial JSON diff stored per match ────────────────────
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS match_edits (
+                matchid    VARCHAR(64) PRIMARY KEY,
+                edits_json LONGTEXT    NOT NULL,
+                edited_at  DATETIME    NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) CHARACTER SET utf8mb4
+        """)
+
+        # ── career totals per player, rebuilt from MatchZy every 5 min ──────────
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS player_career_summary (
+                steamid64      VARCHAR(64)  PRIMARY KEY,
+                name           VARCHAR(255) NOT NULL DEFAULT '',
+                matches_played INT          NOT NULL DEFAULT 0,
+                kills          INT          NOT NULL DEFAULT 0,
+                deaths         INT          NOT NULL DEFAULT 0,
+                assists        INT          NOT NULL DEFAULT 0,
+                headshots      INT          NOT NULL DEFAULT 0,
+                total_damage   BIGINT       NOT NULL DEFAULT 0,
+                aces           INT          NOT NULL DEFAULT 0,
+                clutch_wins    INT          NOT NULL DEFAULT 0,
+                entry_wins     INT          NOT NULL DEFAULT 0,
+                updated_at     DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                KEY idx_pcs_name (name),
+                KEY idx_pcs_kills (kills)
+            ) CHARACTER SET utf8mb4
+        """)
+        _ensure_index(c, "player_career_summary", "idx_pcs_kills", "kills")
+
+        # map_stats and player_stats are intentionally NOT created here.
+        # MatchZy writes matchzy_stats_maps, matchzy_stats_players, and
+        # matchzy_stats_matches to MySQL automatically when matches finish.
+        # The bot reads from those tables — it does not duplicate them.
+        # We only add read indexes for the per-player aggregates, the
+        # name -> steamid64 lookups behind /profile, search and renames, and
+        # the newest-first match listing (once MatchZy has created its tables).
+        _ensure_index(c, "matchzy_stats_players", "idx_mzp_steamid_kills", "steamid64, kills")
+        _ensure_index(c, "matchzy_stats_players", "idx_mzp_name", "name")
+        # Served only get_matchzy_match_mvp, which nothing calls; not worth
+        # the extra write on every MatchZy insert
+        _drop_index(c, "matchzy_stats_players", "idx_mzp_mvp")
+        _ensure_index(c, "matchzy_stats_matches", "idx_mzm_end_time", "end_time")
+
+        conn.commit()
+        c.close()
     print("✓ Database initialized (Railway MySQL)")
 
 try:
@@ -2468,150 +2736,373 @@ MATCHZY_TABLES = {
     "players": "matchzy_stats_players",
 }
 
-def matchzy_tables_exist(conn) -> bool:
-    """Return True if MatchZy tables are present in the database."""
+# MatchZy presence, memoized by matchzy_tables_exist(); /refreshdb re-probes
+_HAS_MATCHZY: bool | None = None
+_HAS_MATCHZY_CHECKED = 0.0
+# MatchZy only creates its tables after the first finished match, so a
+# "not found" answer is re-checked this often instead of being kept forever
+MATCHZY_RECHECK_SECONDS = 300
+
+def matchzy_tables_exist(conn, refresh: bool = False) -> bool:
+    """Return True if MatchZy tables are present in the database.
+
+    Tables don't disappear at runtime, so a positive answer is memoized for
+    good and a negative one for MATCHZY_RECHECK_SECONDS; pass refresh=True
+    to probe again.
+    """
+    global _HAS_MATCHZY, _HAS_MATCHZY_CHECKED
+    if not refresh:
+        if _HAS_MATCHZY:
+            return True
+        if (_HAS_MATCHZY is False
+                and _time.monotonic() - _HAS_MATCHZY_CHECKED < MATCHZY_RECHECK_SECONDS):
+            return False
     c = conn.cursor()
-    c.execute("SHOW TABLES LIKE 'matchzy_stats_players'")
+    c.execute(
+        "SELECT 1 FROM information_schema.tables"
+        " WHERE table_schema = DATABASE() AND table_name = %s LIMIT 1",
+        (MATCHZY_TABLES["players"],),
+    )
     result = c.fetchone()
     c.close()
-    return result is not None
+    _HAS_MATCHZY = result is not None
+    _HAS_MATCHZY_CHECKED = _time.monotonic()
+    return _HAS_MATCHZY
+
+# Upper-case LIKE patterns for bots / GOTV relays rather than real players.
+# Anchored (prefix or exact), so "ROBOT X" or "Abbot Y" aren't dropped.
+BOT_FILTER = ("BOT %", "[BOT]%", "GOTV", "CSTV", "SOURCETV")
+# Same filter baked into SQL once — constants only, never user input.
+# Written as '%%' so it is also safe in parameterised statements; to LIKE,
+# '%%' means the same as '%'.
+_BOT_FILTER_SQL = " AND ".join(
+    f"UPPER(name) NOT LIKE '{pattern.replace('%', '%%')}'" for pattern in BOT_FILTER)
+
+_LEADERBOARD_SQL = f'''
+    SELECT
+        SUBSTRING_INDEX(GROUP_CONCAT(name ORDER BY matchid DESC), ',', 1) AS player_name,
+        steamid64,
+        COUNT(DISTINCT matchid)                      AS matches_played,
+        SUM(kills)                                   AS kills,
+        SUM(deaths)                                  AS deaths,
+        SUM(damage)                                  AS total_damage,
+        ROUND(
+            SUM(kills) / NULLIF(SUM(deaths), 0), 2
+        )                                            AS kd_ratio,
+        ROUND(
+            SUM(head_shot_kills) / NULLIF(SUM(kills), 0) * 100, 1
+        )                                            AS hs_pct
+    FROM {MATCHZY_TABLES["players"]}
+    WHERE steamid64 IS NOT NULL AND steamid64 != '0'
+      AND name IS NOT NULL AND name != ''
+      AND {_BOT_FILTER_SQL}
+    GROUP BY steamid64
+    ORDER BY kills DESC
+    LIMIT %s
+'''
+
+# Same columns as _LEADERBOARD_SQL, read off the precomputed summary
+# (bots are already filtered out when it is built)
+_LEADERBOARD_SUMMARY_SQL = '''
+    SELECT
+        name AS player_name, steamid64, matches_played, kills, deaths, total_damage,
+        ROUND(kills / NULLIF(deaths, 0), 2)          AS kd_ratio,
+        ROUND(headshots / NULLIF(kills, 0) * 100, 1) AS hs_pct
+    FROM player_career_summary
+    ORDER BY kills DESC
+    LIMIT %s
+'''
+
+def get_matchzy_leaderboard(limit: int = 10) -> list[dict]:
+    """Top players by career kills from MatchZy, bots excluded.
+
+    Served from player_career_summary; aggregated live from MatchZy until the
+    summary has been populated.
+    """
+    cached = _cache_get(f'mz_leaderboard:{limit}')
+    if cached is not None:
+        return cached
+    with db_conn() as conn:
+        try:
+            if not matchzy_tables_exist(conn):
+                return []
+
+            c = conn.cursor(dictionary=True)
+            c.execute(_LEADERBOARD_SUMMARY_SQL, (limit,))
+            rows = c.fetchall()
+            if not rows:
+                c.execute(_LEADERBOARD_SQL, (limit,))
+                rows = c.fetchall()
+            c.close()
+            return _cache_set(f'mz_leaderboard:{limit}', rows) if rows else rows
+        except Exception as e:
+            print(f"[MatchZy] Leaderboard error: {e}")
+            return []
+
+# Rebuild player_career_summary from MatchZy in one statement. steamid64 is
+# normalised to SteamID64 in SQL since the column may hold either form.
+# Every row written gets the run's timestamp (%s) so rows the aggregate no
+# longer produces can be pruned afterwards by _CAREER_SUMMARY_PRUNE_SQL.
+_CAREER_SUMMARY_REFRESH_SQL = f'''
+    INSERT INTO player_career_summary
+        (steamid64, name, matches_played, kills, deaths, assists, headshots,
+         total_damage, aces, clutch_wins, entry_wins, updated_at)
+    SELECT * FROM (
+        SELECT
+            CAST(IF(CAST(steamid64 AS UNSIGNED) < 4294967296,
+                    CAST(steamid64 AS UNSIGNED) + {STEAMID64_BASE},
+                    CAST(steamid64 AS UNSIGNED)) AS CHAR)        AS sid,
+            -- Name from the newest match: max of (zero-padded matchid, name), so
+            -- no per-player list is built (GROUP_CONCAT overflows
+            -- group_concat_max_len for active players, an error in INSERT…SELECT)
+            SUBSTRING(MAX(CONCAT(LPAD(matchid, 20, '0'), name)), 21) AS latest_name,
+            COUNT(DISTINCT matchid)                              AS n_matches,
+            SUM(kills) AS k, SUM(deaths) AS d, SUM(assists) AS a,
+            SUM(head_shot_kills) AS hs, SUM(damage) AS dmg, SUM(enemies5k) AS ace,
+            SUM(v1_wins) AS clutch, SUM(entry_wins) AS entry, %s AS ts
+        FROM {MATCHZY_TABLES["players"]}
+        WHERE steamid64 IS NOT NULL AND steamid64 != '0'
+          AND name IS NOT NULL AND name != ''
+          AND {_BOT_FILTER_SQL}
+        GROUP BY sid
+    ) AS agg  -- derived table keeps the UPDATE's column names unambiguous
+    -- VALUES() is deprecated from MySQL 8.0.20, but the row-alias form needs
+    -- 8.0.19+ and isn't supported by MySQL 5.7 or MariaDB, which this bot also runs on
+    ON DUPLICATE KEY UPDATE
+        name = VALUES(name), matches_played = VALUES(matches_played),
+        kills = VALUES(kills), deaths = VALUES(deaths), assists = VALUES(assists),
+        headshots = VALUES(headshots), total_damage = VALUES(total_damage),
+        aces = VALUES(aces), clutch_wins = VALUES(clutch_wins),
+        entry_wins = VALUES(entry_wins), updated_at = VALUES(updated_at)
+'''
+
+# Players no longer in MatchZy (deleted matches, table reset) weren't touched
+# by this run's upsert
+_CAREER_SUMMARY_PRUNE_SQL = "DELETE FROM player_career_summary WHERE updated_at < %s"
+
+_CAREER_SUMMARY_SELECT = '''
+    SELECT
+        name, steamid64, matches_played, kills, deaths, assists, headshots,
+        total_damage, aces, clutch_wins, entry_wins,
+        ROUND(kills / NULLIF(deaths, 0), 2)          AS kd_ratio,
+        ROUND(headshots / NULLIF(kills, 0) * 100, 1) AS hs_pct
+    FROM player_career_summary
+'''
+
+def refresh_career_summary() -> int:
+    """Recompute player_career_summary from matchzy_stats_players. Blocking; returns rows affected.
+
+    Upsert and prune run in one transaction, so readers never see a
+    half-rebuilt summary.
+    """
+    with db_conn() as conn:
+        if not matchzy_tables_exist(conn):
+            return 0
+        c = conn.cursor()
+        try:
+            # The server's own clock, so earlier runs' NOW() stamps compare cleanly
+            c.execute("SELECT NOW()")
+            run_ts = c.fetchone()[0]
+            c.execute(_CAREER_SUMMARY_REFRESH_SQL, (run_ts,))
+            affected = c.rowcount
+            c.execute(_CAREER_SUMMARY_PRUNE_SQL, (run_ts,))
+            affected += c.rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            c.close()
+        return affected
+
+async def refresh_career_summary_now():
+    """Rebuild player_career_summary right away and drop every cached view of
+    it. For edit paths that rewrite matchzy_stats_players, which would
+    otherwise wait up to 5 minutes for refresh_career_summary_task.
+    Refresh errors are logged; the periodic task catches up."""
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, refresh_career_summary)
+    except Exception as e:
+        print(f"[career-summary] refresh error: {e}")
+    _bust_edits_cache()
+
+# /profile lookups, keyed by ('sid', steamid64) or ('name', lowercased name)
+_PROFILE_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_PROFILE_CACHE_TTL = 45
+_PROFILE_CACHE_MAX = 256
 
 def get_matchzy_player_stats(steamid64: str = None, player_name: str = None) -> dict | None:
     """
     Pull aggregated career stats for a player from MatchZy tables.
-    Lookup by steamid64 (preferred) or name.
+    Lookup by steamid64 (preferred) or name. Served from player_career_summary
+    when the player is there; otherwise aggregated live from MatchZy.
     Returns None if MatchZy tables don't exist or player not found.
+    Results are cached for _PROFILE_CACHE_TTL seconds.
     """
-    conn = get_db()
-    try:
-        if not matchzy_tables_exist(conn):
-            return None
+    if steamid64:
+        key = ('sid', to_steamid64(steamid64))
+    elif player_name:
+        key = ('name', player_name.lower())
+    else:
+        return None
+    cached = _lru_get(_PROFILE_CACHE, key, _PROFILE_CACHE_TTL)
+    if cached is not None:
+        return cached
+    row = _get_matchzy_player_stats_uncached(steamid64, player_name)
+    if row:
+        _lru_set(_PROFILE_CACHE, key, row, _PROFILE_CACHE_MAX)
+    return row
+
+def _get_matchzy_player_stats_uncached(steamid64: str = None, player_name: str = None) -> dict | None:
+    with db_conn() as conn:
+        try:
+            if not matchzy_tables_exist(conn):
+                return None
+
+            c = conn.cursor(dictionary=True)
+            table = MATCHZY_TABLES["players"]
 
-        c = conn.cursor(dictionary=True)
-        table = MATCHZY_TABLES["players"]
+            if steamid64:
+                c.execute(_CAREER_SUMMARY_SELECT + " WHERE steamid64 = %s", (to_steamid64(steamid64),))
+            elif player_name:
+                c.execute(_CAREER_SUMMARY_SELECT + " WHERE name = %s ORDER BY matches_played DESC LIMIT 1",
+                          (player_name,))
+            else:
+                return None
+            row = c.fetchone()
+            if row:
+                c.close()
+                return row
+
+            if steamid64:
+                where = "steamid64 IN (%s, %s)"
+                param = sid_variants(steamid64)
+            elif player_name:
+                where = "name = %s"
+                param = (player_name,)
+            else:
+                return None
 
-        if steamid64:
-            where = "steamid64 IN (%s, %s)"
-            param = sid_variants(steamid64)
-        elif player_name:
-            where = "name = %s"
-            param = (player_name,)
-        else:
-            return None
+            c.execute(f'''
+                SELECT
+                    name,
+                    steamid64,
+                    COUNT(DISTINCT matchid)                      AS matches_played,
+                    SUM(kills)                                   AS kills,
+                    SUM(deaths)                                  AS deaths,
+                    SUM(assists)                                 AS assists,
+                    SUM(head_shot_kills)                         AS headshots,
+                    SUM(damage)                                  AS total_damage,
+                    SUM(enemies5k)                               AS aces,
+                    SUM(v1_wins)                                 AS clutch_wins,
+                    SUM(entry_wins)                              AS entry_wins,
+                    ROUND(
+                        SUM(kills) / NULLIF(SUM(deaths), 0), 2
+                    )                                            AS kd_ratio,
+                    ROUND(
+                        SUM(head_shot_kills) / NULLIF(SUM(kills), 0) * 100, 1
+                    )                                            AS hs_pct
+                FROM {table}
+                WHERE {where} AND {_BOT_FILTER_SQL}
+                GROUP BY steamid64, name
+            ''', param)
 
-        c.execute(f'''
-            SELECT
-                name,
-                steamid64,
-                COUNT(DISTINCT matchid)                      AS matches_played,
-                SUM(kills)                                   AS kills,
-                SUM(deaths)                                  AS deaths,
-                SUM(assists)                                 AS assists,
-                SUM(head_shot_kills)                         AS headshots,
-                SUM(damage)                                  AS total_damage,
-                SUM(enemies5k)                               AS aces,
-                SUM(v1_wins)                                 AS clutch_wins,
-                SUM(entry_wins)                              AS entry_wins,
-                ROUND(
-                    SUM(kills) / NULLIF(SUM(deaths), 0), 2
-                )                                            AS kd_ratio,
-                ROUND(
-                    SUM(head_shot_kills) / NULLIF(SUM(kills), 0) * 100, 1
-                )                                            AS hs_pct
-            FROM {table}
-            WHERE {where}
-            GROUP BY steamid64, name
-        ''', param)
-
-        row = c.fetchone()
-        if row and steamid64:
-            row = dict(row)
-            row['steamid64'] = to_steamid64(str(row['steamid64']))
-        c.close()
-        return row
-    except Exception as e:
-        print(f"[MatchZy] Error fetching player stats: {e}")
-        return None
-    finally:
-        conn.close()
+            row = c.fetchone()
+            if row and steamid64:
+                row = dict(row)
+                row['steamid64'] = to_steamid64(str(row['steamid64']))
+            c.close()
+            return row
+        except Exception as e:
+            print(f"[MatchZy] Error fetching player stats: {e}")
+            return None
 
 def get_matchzy_recent_matches(limit: int = 5) -> list[dict]:
     """
-    Return recent matches. Joins matchzy_stats_matches (team names) with
-    matchzy_stats_maps (per-map results).
+    Return the `limit` most recent matches, one row per map played. Joins
+    matchzy_stats_matches (team names) with matchzy_stats_maps (per-map results).
     """
-    conn = get_db()
-    try:
-        if not matchzy_tables_exist(conn):
-            return []
+    cached = _cache_get(f'mz_recent:{limit}')
+    if cached is not None:
+        return cached
+    with db_conn() as conn:
+        try:
+            if not matchzy_tables_exist(conn):
+                return []
 
-        c = conn.cursor(dictionary=True)
-        # Use matchzy_stats_matches for team names + matchzy_stats_maps for map detail
-        c.execute(f'''
-            SELECT
-                m.matchid,
-                m.start_time,
-                m.end_time,
-                m.winner,
-                m.series_type,
-                m.team1_name,
-                m.team2_name,
-                mp.mapname,
-                mp.team1_score,
-                mp.team2_score,
-                mp.mapnumber
-            FROM {MATCHZY_TABLES["matches"]} m
-            LEFT JOIN {MATCHZY_TABLES["maps"]} mp
-                ON m.matchid = mp.matchid
-            ORDER BY m.end_time DESC
-            LIMIT %s
-        ''', (limit,))
-        rows = c.fetchall()
-        c.close()
-        return rows
-    except Exception as e:
-        print(f"[MatchZy] Recent matches error: {e}")
-        return []
-    finally:
-        conn.close()
+            c = conn.cursor(dictionary=True)
+            # Pick the newest matches first (idx_mzm_end_time), then join only their maps
+            c.execute(f'''
+                SELECT
+                    m.matchid,
+                    m.start_time,
+                    m.end_time,
+                    m.winner,
+                    m.series_type,
+                    m.team1_name,
+                    m.team2_name,
+                    mp.mapname,
+                    mp.team1_score,
+                    mp.team2_score,
+                    mp.mapnumber
+                FROM (
+                    SELECT matchid, start_time, end_time, winner, series_type,
+                           team1_name, team2_name
+                    FROM {MATCHZY_TABLES["matches"]}
+                    ORDER BY end_time DESC
+                    LIMIT %s
+                ) m
+                LEFT JOIN {MATCHZY_TABLES["maps"]} mp
+                    ON m.matchid = mp.matchid
+                ORDER BY m.end_time DESC, mp.mapnumber
+            ''', (limit,))
+            rows = c.fetchall()
+            c.close()
+            return _cache_set(f'mz_recent:{limit}', rows) if rows else rows
+        except Exception as e:
+            print(f"[MatchZy] Recent matches error: {e}")
+            return []
 
 def get_matchzy_match_mvp(matchid: str, mapnumber: int = None) -> dict | None:
     """Return the top-kill player for a given match (by kills, since no rating col)."""
-    conn = get_db()
-    try:
-        if not matchzy_tables_exist(conn):
-            return None
+    with db_conn() as conn:
+        try:
+            if not matchzy_tables_exist(conn):
+                return None
 
-        c = conn.cursor(dictionary=True)
-        table = MATCHZY_TABLES["players"]
-        extra = "AND mapnumber = %s" if mapnumber is not None else ""
-        params = [matchid]
-        if mapnumber is not None:
-            params.append(mapnumber)
-        params.append(1)
-
-        c.execute(f'''
-            SELECT name, steamid64, kills, deaths, assists, head_shot_kills, damage
-            FROM {table}
-            WHERE matchid = %s {extra}
-            ORDER BY kills DESC
-            LIMIT %s
-        ''', params)
-        row = c.fetchone()
-        c.close()
-        return row
-    except Exception as e:
-        print(f"[MatchZy] MVP lookup error: {e}")
-        return None
-    finally:
-        conn.close()
+            c = conn.cursor(dictionary=True)
+            table = MATCHZY_TABLES["players"]
+            extra = "AND mapnumber = %s" if mapnumber is not None else ""
+            params = [matchid]
+            if mapnumber is not None:
+                params.append(mapnumber)
+            params.append(1)
+
+            c.execute(f'''
+                SELECT name, steamid64, kills, deaths, assists, head_shot_kills, damage
+                FROM {table}
+                WHERE matchid = %s {extra} AND {_BOT_FILTER_SQL}
+                ORDER BY kills DESC
+                LIMIT %s
+            ''', params)
+            row = c.fetchone()
+            c.close()
+            return row
+        except Exception as e:
+            print(f"[MatchZy] MVP lookup error: {e}")
+            return None
 
 # ========== PAGINATION VIEW FOR DEMOS ==========
 class DemosView(View):
     def __init__(self, offset=0):
         super().__init__(timeout=300)
         self.offset = offset
+        self._last_render = None  # what the message currently shows
         self.update_buttons()
+
+    def render_key(self, embed: discord.Embed) -> str:
+        buttons = [(item.custom_id, item.disabled) for item in self.children]
+        return json.dumps([embed.to_dict(), buttons], sort_keys=True, default=str)
     
     def update_buttons(self):
         self.clear_items()
@@ -2635,11 +3126,11 @@ class DemosView(View):
         await self.update_message(interaction)
     
     async def refresh_page(self, interaction: discord.Interaction):
-        await self.update_message(interaction)
+        await self.update_message(interaction, refresh=True)
     
-    async def update_message(self, interaction: discord.Interaction):
+    async def update_message(self, interaction: discord.Interaction, refresh=False):
         await interaction.response.defer()
-        result = fetch_demos(self.offset, 5)
+        result = await fetch_demos(self.offset, 5, refresh=refresh)
         embed = discord.Embed(
             title="🎥 Server Demos",
             description="\n\n".join(result["demos"]),
@@ -2652,6 +3143,11 @@ class DemosView(View):
             for item in self.children:
                 if item.custom_id == "next":
                     item.disabled = True
+        # Refresh with nothing new (or paging past the end) — don't spend an edit on it
+        key = self.render_key(embed)
+        if key == self._last_render:
+            return
+        self._last_render = key
         await interaction.followup.edit_message(
             message_id=interaction.message.id, embed=embed, view=self
         )
@@ -2662,33 +3158,141 @@ def owner_only():
         return interaction.user.id == ADMIN_ID
     return app_commands.check(predicate)
 
-def is_bot_player(player_name: str) -> bool:
-    player_upper = player_name.upper()
-    return any(kw in player_upper for kw in BOT_FILTER)
-
-def send_rcon(command: str) -> str:
-    try:
-        with MCRcon(RCON_IP, RCON_PASSWORD, port=RCON_PORT) as rcon:
-            resp = rcon.command(command)
-            if not resp or resp.strip() == "":
-                return "✅ Command executed successfully"
-            if any(i in resp.lower() for i in ["success", "completed", "done"]):
-                return f"✅ {resp[:1000]}"
-            response_text = resp[:2000] if len(resp) > 2000 else resp
-            if any(e in resp.lower() for e in ["error", "failed", "invalid", "unknown"]):
-                return f"⚠️ {response_text}"
-            return response_text
+class RconAuthError(Exception):
+    pass
+
+class AsyncRcon:
+    """Minimal asyncio Source RCON client holding one authenticated connection.
+
+    Commands are serialised by a lock. A command that fails before it reaches
+    the server (connect, auth, write) is retried once on a fresh connection;
+    once it has been sent it is never retried, since bans, kicks and map
+    changes must not run twice.
+    """
+    SERVERDATA_AUTH = 3
+    SERVERDATA_AUTH_RESPONSE = 2
+    SERVERDATA_EXECCOMMAND = 2
+    SERVERDATA_RESPONSE_VALUE = 0
+
+    def __init__(self, host: str, port: int, password: str, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+        self._next_id = 0
+
+    def _send(self, ptype: int, body: str) -> int:
+        self._next_id = self._next_id % 0x7FFFFFFF + 1
+        data = struct.pack("<ii", self._next_id, ptype) + body.encode("utf-8") + b"\x00\x00"
+        self._writer.write(struct.pack("<i", len(data)) + data)
+        return self._next_id
+
+    async def _read_packet(self, wait: float):
+        # Only the header read is bounded by `wait`; once a packet has started, read all of it
+        size, = struct.unpack("<i", await asyncio.wait_for(self._reader.readexactly(4), wait))
+        payload = await asyncio.wait_for(self._reader.readexactly(size), self.timeout)
+        pid, ptype = struct.unpack("<ii", payload[:8])
+        return pid, ptype, payload[8:-2].decode("utf-8", "replace")
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+        self._send(self.SERVERDATA_AUTH, self.password)
+        await self._writer.drain()
+        while True:
+            pid, ptype, _ = await self._read_packet(self.timeout)
+            if ptype == self.SERVERDATA_AUTH_RESPONSE:
+                if pid == -1:
+                    raise RconAuthError("RCON authentication failed")
+                return
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    def _usable(self) -> bool:
+        # A server restart or idle drop only shows up as EOF on the reader;
+        # the writer doesn't report closing until we try to use it
+        return (self._writer is not None and not self._writer.is_closing()
+                and not self._reader.at_eof())
+
+    async def command(self, command: str) -> str:
+        async with self._lock:
+            for attempt in (1, 2):
+                sent = False
+                try:
+                    if not self._usable():
+                        self._close()
+                        await self._connect()
+                    req_id = self._send(self.SERVERDATA_EXECCOMMAND, command)
+                    # Long replies arrive as several packets; the server answers an
+                    # empty RESPONSE_VALUE only after them, so its echo ends the reply
+                    end_id = self._send(self.SERVERDATA_RESPONSE_VALUE, "")
+                    await self._writer.drain()
+                    sent = True
+                    parts = []
+                    while True:
+                        try:
+                            pid, ptype, body = await self._read_packet(self.timeout)
+                        except asyncio.TimeoutError:
+                            # Server that doesn't echo the marker: keep what arrived
+                            if parts:
+                                break
+                            raise
+                        if pid == end_id:
+                            break
+                        # Late packets from an earlier command carry an older id; skip them
+                        if pid == req_id and ptype == self.SERVERDATA_RESPONSE_VALUE:
+                            parts.append(body)
+                    return "".join(parts)
+                except BaseException as e:
+                    # Any failure (bad packet, cancellation, ...) leaves the stream
+                    # mid-packet, so the connection can't be reused
+                    self._close()
+                    retryable = isinstance(
+                        e, (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError))
+                    if sent or attempt == 2 or not retryable:
+                        raise
+
+_RCON = AsyncRcon(RCON_IP, RCON_PORT, RCON_PASSWORD)
+
+async def send_rcon(command: str) -> str:
+    try:
+        resp = await _RCON.command(command)
+        if not resp or resp.strip() == "":
+            return "✅ Command executed successfully"
+        if any(i in resp.lower() for i in ["success", "completed", "done"]):
+            return f"✅ {resp[:1000]}"
+        response_text = resp[:2000] if len(resp) > 2000 else resp
+        if any(e in resp.lower() for e in ["error", "failed", "invalid", "unknown"]):
+            return f"⚠️ {response_text}"
+        return response_text
+    except asyncio.TimeoutError:
+        return "❌ RCON Connection Error: timed out"
     except Exception as e:
-        return f"❌ RCON Connection Error: {e}"
+        return f"❌ RCON Connection Error: {e or type(e).__name__}"
 
-def send_rcon_silent(command: str):
+async def send_rcon_silent(command: str):
     try:
-        with MCRcon(RCON_IP, RCON_PASSWORD, port=RCON_PORT) as rcon:
-            rcon.command(command)
-    except:
+        await _RCON.command(command)
+    except (OSError, EOFError, asyncio.TimeoutError, RconAuthError):
         pass
 
-def fetch_demos(offset=0, limit=5):
+# How long the sorted fshost listing is reused before /demos refetches it
+DEMOS_VIEW_CACHE_TTL = 60
+# Shared by /demos and every DemosView: {"demos": sorted list, "ts": monotonic}
+_DEMOS_LISTING: dict = {}
+
+async def fetch_demos(offset=0, limit=5, refresh=False):
+    """
+    Return one formatted page of the fshost demo listing.
+    The sorted listing is kept in _DEMOS_LISTING for DEMOS_VIEW_CACHE_TTL
+    seconds so paging only slices; refresh=True bypasses it.
+    """
     if not DEMOS_JSON_URL:
         return {"demos": ["DEMOS_JSON_URL not configured"], "has_more": False}
     headers = {
@@ -2697,15 +3301,21 @@ def fetch_demos(offset=0, limit=5):
         'Referer': 'https://fshost.me/'
     }
     try:
-        response = requests.get(DEMOS_JSON_URL, headers=headers, timeout=15)
-        if response.status_code == 403:
-            return {"demos": ["Access Denied (403). URL may have expired."], "has_more": False}
-        response.raise_for_status()
-        data = response.json()
-        demos = data.get("demos", [])
-        if not demos:
-            return {"demos": ["No demos available"], "has_more": False}
-        demos_sorted = sorted(demos, key=lambda x: x.get("modified_at", ""), reverse=True)
+        cache = _DEMOS_LISTING
+        if (cache and not refresh
+                and _time.monotonic() - cache["ts"] < DEMOS_VIEW_CACHE_TTL):
+            demos_sorted = cache["demos"]
+        else:
+            async with _get_http_session().get(DEMOS_JSON_URL, headers=headers) as response:
+                if response.status == 403:
+                    return {"demos": ["Access Denied (403). URL may have expired."], "has_more": False}
+                response.raise_for_status()
+                data = _json_loads(await response.read())
+            demos = data.get("demos", [])
+            if not demos:
+                return {"demos": ["No demos available"], "has_more": False}
+            demos_sorted = sorted(demos, key=lambda x: x.get("modified_at", ""), reverse=True)
+            cache.update(demos=demos_sorted, ts=_time.monotonic())
         start_idx = offset
         end_idx = offset + limit
         page_demos = demos_sorted[start_idx:end_idx]
@@ -2719,7 +3329,7 @@ def fetch_demos(offset=0, limit=5):
             try:
                 date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
                 date_display = date_obj.strftime("%b %d, %Y %H:%M")
-            except:
+            except (ValueError, AttributeError):
                 date_display = "Unknown date"
             formatted_demos.append(
                 f"🎬 [{name}](<{url}>)\n    📅 {date_display} • 💾 {size}"
@@ -2736,10 +3346,26 @@ def fetch_demos(offset=0, limit=5):
 # Demo filename format: YYYY-MM-DD_HH-MM-SS_<matchnum>_<mapname>_<team1>_vs_<team2>.dem
 DEMO_TS_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})')
 
+def _parse_demo_ts(s: str, tz=pytz.utc) -> datetime:
+    """Parse a fixed-width 'YYYY-MM-DD_HH-MM-SS' stamp by slicing (much cheaper than strptime)."""
+    return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                    int(s[11:13]), int(s[14:16]), int(s[17:19]), tzinfo=tz)
+
 # Cache for match ID to demo mapping (refreshed every 5 minutes)
 _MATCHID_DEMO_CACHE = None
 _MATCHID_CACHE_TIME = None
 _CACHE_TTL_SECONDS = 300  # 5 minutes
+# Only one thread rebuilds the map at a time; others reuse its result
+_MATCHID_BUILD_LOCK = threading.Lock()
+
+# Keep-alive session for the blocking fshost fetches (listing + one JSON per
+# match on every map rebuild), so they share TCP/TLS connections
+_FSHOST_SESSION = requests.Session()
+_FSHOST_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_FSHOST_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Referer': 'https://fshost.me/'
+})
 
 def build_matchid_to_demo_map(force_refresh=False):
     """
@@ -2756,12 +3382,26 @@ def build_matchid_to_demo_map(force_refresh=False):
       }
     }
     """
-    global _MATCHID_DEMO_CACHE, _MATCHID_CACHE_TIME
-
     if not force_refresh and _MATCHID_DEMO_CACHE is not None and _MATCHID_CACHE_TIME is not None:
         if (datetime.now() - _MATCHID_CACHE_TIME).total_seconds() < _CACHE_TTL_SECONDS:
             return _MATCHID_DEMO_CACHE
 
+    requested_at = datetime.now()
+    # A rebuild is already running: serve the stale map instead of starting another
+    if not _MATCHID_BUILD_LOCK.acquire(blocking=force_refresh or _MATCHID_DEMO_CACHE is None):
+        return _MATCHID_DEMO_CACHE
+    try:
+        # Someone else finished a rebuild while we were waiting for the lock
+        if _MATCHID_CACHE_TIME is not None and _MATCHID_CACHE_TIME >= requested_at:
+            return _MATCHID_DEMO_CACHE
+        return _rebuild_matchid_to_demo_map()
+    finally:
+        _MATCHID_BUILD_LOCK.release()
+
+def _rebuild_matchid_to_demo_map():
+    """Fetch and index every fshost JSON. Caller must hold _MATCHID_BUILD_LOCK."""
+    global _MATCHID_DEMO_CACHE, _MATCHID_CACHE_TIME
+
     print("[Demo Map] Building matchid map from all fshost .json files...")
     all_files = fetch_all_demos_raw()
 
@@ -2773,7 +3413,6 @@ def build_matchid_to_demo_map(force_refresh=False):
             dem_by_base[n[:-4]] = f  # strip .dem
 
     matchid_map = {}
-    headers = {'User-Agent': 'Mozilla/5.0', 'Referer': 'https://fshost.me/'}
 
     for file_obj in all_files:
         name = file_obj.get("name", "")
@@ -2783,9 +3422,9 @@ def build_matchid_to_demo_map(force_refresh=False):
         if not url:
             continue
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
+            resp = _FSHOST_SESSION.get(url, timeout=10)
             resp.raise_for_status()
-            metadata = resp.json()
+            metadata = _json_loads(resp.content)
         except Exception as e:
             print(f"[Demo Map] ✗ {name}: {e}")
             continue
@@ -2809,7 +3448,6 @@ def build_matchid_to_demo_map(force_refresh=False):
             "size_formatted":dem_entry.get("size_formatted", ""),
             "modified_at":   dem_entry.get("modified_at", ""),
         }
-        print(f"[Demo Map] ✓ match {matchid} ← {name}" + (f" + {dem_entry.get('name')}" if dem_entry else " (no demo)"))
 
     print(f"[Demo Map] Total: {len(matchid_map)} matches indexed from {sum(1 for f in all_files if f.get('name','').endswith('.json'))} JSONs")
 
@@ -2821,19 +3459,40 @@ def fetch_all_demos_raw():
     """Return the raw list of demo dicts from fshost, sorted newest first."""
     if not DEMOS_JSON_URL:
         return []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'application/json',
-        'Referer': 'https://fshost.me/'
-    }
     try:
-        r = requests.get(DEMOS_JSON_URL, headers=headers, timeout=15)
+        r = _FSHOST_SESSION.get(DEMOS_JSON_URL, headers={'Accept': 'application/json'}, timeout=15)
         r.raise_for_status()
-        demos = r.json().get("demos", [])
+        demos = _json_loads(r.content).get("demos", [])
         return sorted(demos, key=lambda x: x.get("modified_at", ""), reverse=True)
     except Exception:
         return []
 
+# Timestamped .dem files as (utc_epoch, demo) tuples, newest first
+_DEM_INDEX: list = []
+_DEM_INDEX_TIME = None
+
+def _demo_time_index() -> list:
+    """Sorted epoch index of fshost .dem files for timestamp matching, rebuilt every _CACHE_TTL_SECONDS."""
+    global _DEM_INDEX, _DEM_INDEX_TIME
+    if _DEM_INDEX_TIME is not None and (datetime.now() - _DEM_INDEX_TIME).total_seconds() < _CACHE_TTL_SECONDS:
+        return _DEM_INDEX
+    index = []
+    for demo in fetch_all_demos_raw():
+        name = demo.get("name", "")
+        if not name.endswith(".dem"):
+            continue
+        m = DEMO_TS_RE.match(name)
+        if not m:
+            continue
+        try:
+            index.append((int(_parse_demo_ts(m.group(1)).timestamp()), demo))
+        except ValueError:
+            continue
+    index.sort(key=lambda t: t[0], reverse=True)
+    if index:  # don't pin an empty index for 5 minutes after a failed fetch
+        _DEM_INDEX, _DEM_INDEX_TIME = index, datetime.now()
+    return index
+
 def find_demo_for_match(match_end_time_or_id, window_minutes=10):
     """
     Try to match a demo file to a match.
@@ -2859,10 +3518,7 @@ def find_demo_for_match(match_end_time_or_id, window_minutes=10):
             matchid_map = build_matchid_to_demo_map()
             if match_end_time_or_id in matchid_map:
                 demo = matchid_map[match_end_time_or_id]
-                print(f"[Demo Match] ✓ Found exact match for ID {match_end_time_or_id}: {demo.get('name')}")
                 return demo.get("name"), demo.get("download_url", "#")
-            else:
-                print(f"[Demo Match] ✗ No exact match found for ID {match_end_time_or_id}")
         except Exception as e:
             print(f"[Demo Match] Error using matchid map: {e}")
         return None, None
@@ -2874,78 +3530,82 @@ def find_demo_for_match(match_end_time_or_id, window_minutes=10):
     if not isinstance(end_time, datetime):
         return None, None
     
-    print(f"[Demo Match] Using timestamp matching (fallback) for {end_time}")
-    
     # Make end_time timezone-aware (UTC) if it isn't already
     if end_time.tzinfo is None:
         end_time = end_time.replace(tzinfo=pytz.utc)
     
-    demos = fetch_all_demos_raw()
-    # Filter to only .dem files for timestamp matching
-    demos = [d for d in demos if d.get("name", "").endswith(".dem")]
-    
+    end_epoch = int(end_time.timestamp())
+    window = window_minutes * 60
     best = None
     best_delta = None
-    for demo in demos:
-        name = demo.get("name", "")
-        m = DEMO_TS_RE.match(name)
-        if not m:
-            continue
-        try:
-            demo_dt = datetime.strptime(m.group(1), "%Y-%m-%d_%H-%M-%S").replace(tzinfo=pytz.utc)
-        except ValueError:
+    for demo_epoch, demo in _demo_time_index():
+        if demo_epoch > end_epoch + window:
             continue
-        delta = abs((demo_dt - end_time).total_seconds())
-        if delta <= window_minutes * 60:
-            if best_delta is None or delta < best_delta:
-                best = demo
-                best_delta = delta
+        if demo_epoch < end_epoch - window:
+            break  # everything after this is older still
+        delta = abs(demo_epoch - end_epoch)
+        if best_delta is None or delta < best_delta:
+            best = demo
+            best_delta = delta
+            if delta < 10:
+                break  # close enough — no better candidate to find
     
     if best:
-        print(f"[Demo Match] ✓ Found timestamp match: {best.get('name')} (within {best_delta:.0f}s)")
         return best.get("name"), best.get("download_url", "#")
-    
-    print(f"[Demo Match] ✗ No timestamp match found within {window_minutes} minutes")
     return None, None
 
-STATUS_NAME_RE = re.compile(r'^#\s*\d+\s+"(?P<n>.*?)"\s+')
-CSS_LIST_RE = re.compile(r'^\s*•\s*\[#\d+\]\s*"(?P<n>[^"]*)"')
+STATUS_NAME_RE = re.compile(r'^#\s*\d+\s+"(?P<name>.*?)"\s+')
+CSS_LIST_RE = re.compile(r'^\s*•\s*\[#\d+\]\s*"(?P<name>[^"]*)"')
+STATUS_TIME_RE = re.compile(r'\b(\d{1,2}:\d{2})\b')
+STATUS_PING_RE = re.compile(r'(\d+)\s*$')
+
+# Escape Discord markdown/mention characters and drop NULs in a single pass
+_SANITIZE_TABLE = str.maketrans({**{ch: f"\\{ch}" for ch in "*_`~|>@"}, "\x00": None})
 
 def sanitize(s: str) -> str:
     if not s:
         return "-"
-    for ch in ['*', '_', '`', '~', '|', '>', '@']:
-        s = s.replace(ch, f"\\{ch}")
-    return s.replace("\x00", "").strip()
+    return s.translate(_SANITIZE_TABLE).strip()
 
-def rcon_list_players():
-    txt = send_rcon("css_players")
+async def rcon_list_players():
+    txt = await send_rcon("css_players")
     if "Unknown command" in txt or "Error" in txt:
-        txt = send_rcon("status")
-    players = []
+        txt = await send_rcon("status")
+    players = {}  # name -> entry; first sighting wins, insertion order kept
     for line in txt.splitlines():
         line = line.strip()
-        css = CSS_LIST_RE.match(line)
-        if css:
-            players.append({"name": sanitize(css.group("name")), "ping": "-", "time": "-"})
+        # Player rows start with '•' (css_players) or '#' (status); skip headers cheaply
+        if not line or line[0] not in "#•":
+            continue
+        if line[0] == "•":
+            css = CSS_LIST_RE.match(line)
+            if css:
+                name = sanitize(css.group("name"))
+                players.setdefault(name, {"name": name, "ping": "-", "time": "-"})
             continue
         m = STATUS_NAME_RE.match(line)
         if m:
             name = sanitize(m.group("name"))
-            time_match = re.search(r'\b(\d{1,2}:\d{2})\b', line)
-            ping_match = re.search(r'(\d+)\s*$', line.split('"')[-1])
-            players.append({
+            time_match = STATUS_TIME_RE.search(line)
+            ping_match = STATUS_PING_RE.search(line.rpartition('"')[2])
+            players.setdefault(name, {
                 "name": name,
                 "time": time_match.group(1) if time_match else "-",
                 "ping": ping_match.group(1) if ping_match else "-",
             })
-    uniq = []
-    seen = set()
-    for p in players:
-        if p["name"] not in seen:
-            uniq.append(p)
-            seen.add(p["name"])
-    return uniq
+    return list(players.values())
+
+# Cap the status listing so the field stays near Discord's 1024-char limit
+STATUS_MAX_LISTED = 32
+# Status embed colour by fill level: empty, < 1/3, < 2/3, fuller
+_STATUS_COLORS = (0x95A5A6, 0xE74C3C, 0xF39C12, 0x2ECC71)
+STATUS_FOOTER_ICON = "https://cdn.cloudflare.steamstatic.com/steamcommunity/public/images/apps/730/69f7ebe2735c366c65c0b33dae00e12dc40edbe4.jpg"
+LEADERBOARD_MEDALS = ("🥇", "🥈", "🥉")
+
+def _status_color(player_count: int, max_players: int) -> int:
+    if player_count <= 0:
+        return _STATUS_COLORS[0]
+    return _STATUS_COLORS[1 + (player_count >= max_players / 3) + (player_count >= max_players * 2 / 3)]
 
 def flag(cc):
     if not cc or len(cc) != 2:
@@ -2953,28 +3613,37 @@ def flag(cc):
     return "".join(chr(ord(c.upper()) + 127397) for c in cc)
 
 
+async def query_server(timeout: float = 5):
+    """
+    A2S info + players, queried concurrently within roughly `timeout` seconds.
+    Raises if the info query fails; a failed players query yields [] so the
+    caller can fall back to RCON.
+    """
+    # a2s timeouts apply per receive and a challenged query takes two, so each
+    # gets a slice of the budget. No outer wait_for: a slow players reply must
+    # not cancel an info reply that already arrived.
+    per_recv = timeout * 0.4
+    info, players = await asyncio.gather(
+        a2s.ainfo(_SERVER_ADDR, timeout=per_recv),
+        a2s.aplayers(_SERVER_ADDR, timeout=per_recv),
+        return_exceptions=True,
+    )
+    if isinstance(info, BaseException):
+        raise info
+    if isinstance(players, BaseException):
+        players = []
+    return info, players
+
 async def get_enhanced_status_embed():
-    addr = (SERVER_IP, SERVER_PORT)
     try:
-        loop = asyncio.get_running_loop()
-        info = await loop.run_in_executor(None, a2s.info, addr)
-        a2s_players = await asyncio.wait_for(
-            loop.run_in_executor(None, a2s.players, addr), 5
-        )
+        info, a2s_players = await query_server()
         if not a2s_players or all(not getattr(p, "name", "") for p in a2s_players):
-            players = rcon_list_players()
+            players = await rcon_list_players()
         else:
             players = a2s_players
         
         player_count = info.player_count
-        if player_count == 0:
-            color = 0x95A5A6
-        elif player_count < info.max_players / 3:
-            color = 0xE74C3C
-        elif player_count < info.max_players * 2/3:
-            color = 0xF39C12
-        else:
-            color = 0x2ECC71
+        color = _status_color(player_count, info.max_players)
         
         embed = discord.Embed(
             title="🎮 CS2 Server Status",
@@ -2987,11 +3656,14 @@ async def get_enhanced_status_embed():
         embed.add_field(name="🌐 Connect", value=f"`connect {SERVER_IP}:{SERVER_PORT}`", inline=False)
         
         if isinstance(players, list) and players and isinstance(players[0], dict):
-            listing = "\n".join(f"`{i}.` **{p['name']}**" for i, p in enumerate(players, 1))
+            listing = "\n".join(
+                f"`{i}.` **{p['name']}**"
+                for i, p in enumerate(islice(players, STATUS_MAX_LISTED), 1)
+            )
         elif players:
             listing = "\n".join(
                 f"`{i}.` **{sanitize(p.name)}** • `{p.score}` pts"
-                for i, p in enumerate(players, 1)
+                for i, p in enumerate(islice(players, STATUS_MAX_LISTED), 1)
             )
         else:
             listing = "*No players online*"
@@ -3003,10 +3675,10 @@ async def get_enhanced_status_embed():
         )
         embed.set_footer(
             text="Last updated",
-            icon_url="https://cdn.cloudflare.steamstatic.com/steamcommunity/public/images/apps/730/69f7ebe2735c366c65c0b33dae00e12dc40edbe4.jpg"
+            icon_url=STATUS_FOOTER_ICON
         )
         return embed, info
-    except:
+    except Exception:
         embed = discord.Embed(
             title="❌ Server Offline",
             description="The server appears to be offline or unreachable.",
@@ -3030,21 +3702,22 @@ def _sync_fshost_to_db_blocking():
         matchid_map = build_matchid_to_demo_map(force_refresh=True)
         if not matchid_map:
             return 0, 0, 0
-        conn = get_db(); c = conn.cursor()
-        for matchid, entry in matchid_map.items():
-            metadata = entry.get('metadata')
-            if not metadata:
-                skipped += 1; continue
-            try:
-                c.execute("""
-                    INSERT INTO fshost_matches (matchid, raw_json, fetched_at)
-                    VALUES (%s, %s, NOW())
-                    ON DUPLICATE KEY UPDATE raw_json = VALUES(raw_json), updated_at = NOW()
-                """, (str(matchid), json.dumps(metadata, default=str)))
-                inserted += 1
-            except Exception as e:
-                print(f"[fshost-sync] match {matchid}: {e}"); errors += 1
-        conn.commit(); c.close(); conn.close()
+        with db_conn() as conn:
+            c = conn.cursor()
+            for matchid, entry in matchid_map.items():
+                metadata = entry.get('metadata')
+                if not metadata:
+                    skipped += 1; continue
+                try:
+                    c.execute("""
+                        INSERT INTO fshost_matches (matchid, raw_json, fetched_at)
+                        VALUES (%s, %s, NOW())
+                        ON DUPLICATE KEY UPDATE raw_json = VALUES(raw_json), updated_at = NOW()
+                    """, (str(matchid), json.dumps(metadata, default=str)))
+                    inserted += 1
+                except Exception as e:
+                    print(f"[fshost-sync] match {matchid}: {e}"); errors += 1
+            conn.commit(); c.close()
     except Exception as e:
         print(f"[fshost-sync] fatal: {e}"); errors += 1
     return inserted, skipped, errors
@@ -3066,53 +3739,73 @@ async def before_sync():
     await bot.wait_until_ready()
 
 
-@tasks.loop(minutes=1)
-async def update_server_stats():
+@tasks.loop(minutes=5)
+async def refresh_career_summary_task():
+    """Keep player_career_summary within 5 minutes of the MatchZy tables."""
     try:
-        # Kill events are broadcast via SSE only — MatchZy handles all DB writes
-        global pending_kill_events
-        pending_kill_events = []  # clear without writing to DB
-        
-        addr = (SERVER_IP, SERVER_PORT)
         loop = asyncio.get_running_loop()
-        info = await loop.run_in_executor(None, a2s.info, addr)
-        
-        try:
-            a2s_players = await asyncio.wait_for(
-                loop.run_in_executor(None, a2s.players, addr), 5
-            )
-            if not a2s_players:
-                player_list = rcon_list_players()
-            else:
-                player_list = a2s_players
-        except:
-            player_list = []
-        
-        if player_list and isinstance(player_list[0], dict):
-            player_names = [p['name'] for p in player_list]
-        elif player_list:
-            player_names = [sanitize(p.name) for p in player_list]
-        else:
-            player_names = []
-        
-        real_player_names = [name for name in player_names if not is_bot_player(name)]
+        await loop.run_in_executor(None, refresh_career_summary)
     except Exception as e:
-        print(f"Error in update_server_stats: {e}")
+        print(f"[career-summary] refresh error: {e}")
+
+@refresh_career_summary_task.before_loop
+async def before_career_summary():
+    await bot.wait_until_ready()
 
 
+# Last time the game server answered an A2S info query (monotonic seconds)
+_LAST_A2S_OK: float | None = None
+A2S_STALE_AFTER = 10 * 60
+# Set once the current outage has been reported, so it is logged only once
+_A2S_OUTAGE_WARNED = False
+
+@tasks.loop(minutes=5)
+async def server_watchdog():
+    """Cheap liveness probe: one A2S info query, warn once per outage and log the recovery."""
+    global _LAST_A2S_OK, _A2S_OUTAGE_WARNED
+    try:
+        await a2s.ainfo(_SERVER_ADDR, timeout=3)
+        _LAST_A2S_OK = _time.monotonic()
+        if _A2S_OUTAGE_WARNED:
+            _A2S_OUTAGE_WARNED = False
+            print("✓ [watchdog] server reachable via A2S again")
+    except Exception as e:
+        if _A2S_OUTAGE_WARNED:
+            return
+        if _LAST_A2S_OK is None:
+            print(f"[watchdog] A2S probe failed: {e}")
+            _A2S_OUTAGE_WARNED = True
+        elif _time.monotonic() - _LAST_A2S_OK > A2S_STALE_AFTER:
+            mins = int((_time.monotonic() - _LAST_A2S_OK) // 60)
+            print(f"⚠️ [watchdog] server unreachable via A2S for {mins} min: {e}")
+            _A2S_OUTAGE_WARNED = True
+
+@server_watchdog.before_loop
+async def before_watchdog():
+    await bot.wait_until_ready()
+
 
 @bot.event
 async def on_ready():
     print(f"Bot online as {bot.user.name}")
     print(f"Bot ID: {bot.user.id}")
     print(f"Owner ID from env: {ADMIN_ID}")
+    global _SERVER_ADDR
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            SERVER_IP, SERVER_PORT, family=socket.AF_INET, type=socket.SOCK_DGRAM
+        )
+        _SERVER_ADDR = (infos[0][4][0], SERVER_PORT)
+        print(f"✓ A2S address resolved: {SERVER_IP} → {_SERVER_ADDR[0]}")
+    except Exception as e:
+        print(f"⚠️ Could not resolve {SERVER_IP}, A2S will resolve per query: {e}")
     try:
         await start_http_server()
     except Exception as e:
         print(f"⚠️ Failed to start HTTP server: {e}")
     try:
-        send_rcon_silent("mp_logdetail 3")
-        send_rcon_silent("log on")
+        await send_rcon_silent("mp_logdetail 3")
+        await send_rcon_silent("log on")
         print("✓ Server kill logging enabled (mp_logdetail 3)")
     except Exception as e:
         print(f"⚠️ Could not enable kill logging: {e}")
@@ -3125,15 +3818,15 @@ async def on_ready():
     
     # Log MatchZy status on startup
     try:
-        conn = get_db()
-        has_mz = matchzy_tables_exist(conn)
-        conn.close()
+        with db_conn() as conn:
+            has_mz = matchzy_tables_exist(conn, refresh=True)
         print(f"✓ MatchZy tables {'found — using MatchZy stats' if has_mz else 'NOT found — using fallback stats'}")
     except Exception as e:
         print(f"⚠️ Could not check MatchZy tables: {e}")
     
-    update_server_stats.start()
+    server_watchdog.start()
     sync_fshost_to_db.start()
+    refresh_career_summary_task.start()
     print("✓ fshost → DB sync started (runs now + every 30 min)")
 
 @bot.event
@@ -3173,6 +3866,14 @@ async def sync(ctx, guilds: commands.Greedy[discord.Object] = None,
 async def ping(ctx):
     await ctx.send(f"🏓 Pong! Latency: {round(bot.latency * 1000)}ms")
 
+def _demo_url_for_match(matchid, end_time=None):
+    """Demo download URL for a match: exact matchid via .json first, timestamp fallback. Blocking."""
+    demo_name, demo_url = find_demo_for_match(str(matchid))
+    if (not demo_url or demo_url == "#") and end_time:
+        demo_name, demo_url = find_demo_for_match(end_time)
+    return demo_url if demo_url and demo_url != "#" else None
+
+
 @bot.tree.command(name="status", description="View server status")
 async def status_cmd(inter: discord.Interaction):
     await inter.response.defer(ephemeral=True)
@@ -3183,7 +3884,8 @@ async def status_cmd(inter: discord.Interaction):
 @bot.tree.command(name="profile", description="View player stats from MatchZy")
 async def profile_cmd(inter: discord.Interaction, player_name: str):
     await inter.response.defer(ephemeral=True)
-    mz = get_matchzy_player_stats(player_name=player_name)
+    loop = asyncio.get_running_loop()
+    mz = await loop.run_in_executor(None, lambda: get_matchzy_player_stats(player_name=player_name))
     if not mz:
         return await inter.followup.send(
             f"❌ No MatchZy stats found for **{player_name}**\n"
@@ -3226,7 +3928,7 @@ async def profile_cmd(inter: discord.Interaction, player_name: str):
 @bot.tree.command(name="leaderboard", description="Top players (MatchZy kills leaderboard)")
 async def leaderboard_cmd(inter: discord.Interaction):
     await inter.response.defer(ephemeral=True)
-    leaderboard = get_matchzy_leaderboard(10)
+    leaderboard = await asyncio.get_running_loop().run_in_executor(None, get_matchzy_leaderboard, 10)
     if not leaderboard:
         return await inter.followup.send("❌ No player data available yet.", ephemeral=True)
     
@@ -3235,7 +3937,6 @@ async def leaderboard_cmd(inter: discord.Interaction):
         description="*Sorted by kills • Bots excluded*",
         color=0xF1C40F
     )
-    medals = ["🥇", "🥈", "🥉"]
     for i, row in enumerate(leaderboard, 1):
         name     = row.get("player_name", "Unknown")
         kills    = int(row.get("kills") or 0)
@@ -3244,7 +3945,7 @@ async def leaderboard_cmd(inter: discord.Interaction):
         damage   = row.get("total_damage")
         hs_pct   = row.get("hs_pct")
         matches  = row.get("matches_played")
-        medal    = medals[i-1] if i <= 3 else f"`{i}.`"
+        medal    = LEADERBOARD_MEDALS[i-1] if i <= 3 else f"`{i}.`"
         kd_str   = f"K/D: {kd:.2f}" if kd else f"K/D: {kills}/{deaths}"
         extras   = []
         if hs_pct: extras.append(f"HS: {hs_pct}%")
@@ -3257,26 +3958,31 @@ async def leaderboard_cmd(inter: discord.Interaction):
 @bot.tree.command(name="recentmatches", description="Show recent MatchZy matches")
 async def recentmatches_cmd(inter: discord.Interaction):
     await inter.response.defer(ephemeral=True)
-    matches = get_matchzy_recent_matches(5)
+    loop = asyncio.get_running_loop()
+    matches = await loop.run_in_executor(None, get_matchzy_recent_matches, 5)
     if not matches:
         return await inter.followup.send(
             "❌ No match data found. Make sure MatchZy is configured with your MySQL DB.",
             ephemeral=True
         )
     
-    # Build matchid -> demo mapping once using .json files
-    try:
-        matchid_map = build_matchid_to_demo_map()
-        debug_lines = [f"📂 Demos mapped via .json files: **{len(matchid_map)}**"]
-    except Exception as e:
-        matchid_map = {}
-        debug_lines = [f"⚠️ Could not build matchid map: {e}"]
+    # Build matchid -> demo mapping once using .json files, then resolve each
+    # match's demo (matchid first, timestamp fallback) — all off the event loop
+    def lookup_demos():
+        try:
+            matchid_map = build_matchid_to_demo_map()
+            debug = f"📂 Demos mapped via .json files: **{len(matchid_map)}**"
+        except Exception as e:
+            debug = f"⚠️ Could not build matchid map: {e}"
+        return debug, [_demo_url_for_match(m.get("matchid"), m.get("end_time")) for m in matches]
+
+    debug_line, demo_urls = await loop.run_in_executor(None, lookup_demos)
+    debug_lines = [debug_line]
 
     embed = discord.Embed(title="🏟️ Recent Matches", color=0x3498DB)
     embed.set_footer(text=" | ".join(debug_lines))
     
-    for m in matches:
-        matchid  = m.get("matchid")
+    for m, demo_url in zip(matches, demo_urls):
         t1       = m.get("team1_name", "Team 1")
         t2       = m.get("team2_name", "Team 2")
         s1       = m.get("team1_score", 0)
@@ -3289,14 +3995,7 @@ async def recentmatches_cmd(inter: discord.Interaction):
         if winner:
             result += f" — 🏆 **{winner}**"
         
-        # Try to find demo using matchid first (EXACT via .json), then timestamp fallback
-        demo_name, demo_url = find_demo_for_match(str(matchid))  # Try match ID first
-        if not demo_url or demo_url == "#":
-            # Fallback to timestamp matching
-            if end_time:
-                demo_name, demo_url = find_demo_for_match(end_time)
-        
-        if demo_url and demo_url != "#":
+        if demo_url:
             result += f"\n📥 [Download Demo](<{demo_url}>)"
         else:
             result += f"\n*(no demo matched)*"
@@ -3311,12 +4010,24 @@ async def recentmatches_cmd(inter: discord.Interaction):
 @bot.tree.command(name="match", description="Get link to match stats page")
 async def match_cmd(inter: discord.Interaction, match_id: str):
     await inter.response.defer(ephemeral=True)
+    loop = asyncio.get_running_loop()
+
     # Verify match exists
-    conn = get_db()
-    c = conn.cursor(dictionary=True)
-    c.execute(f"SELECT matchid, team1_name, team2_name, team1_score, team2_score, mapname, end_time FROM {MATCHZY_TABLES['matches']} mm LEFT JOIN {MATCHZY_TABLES['maps']} mp ON mm.matchid=mp.matchid WHERE mm.matchid=%s LIMIT 1", (match_id,))
-    row = c.fetchone()
-    c.close(); conn.close()
+    def fetch_match():
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
+            c.execute(f"""
+                SELECT mm.matchid, mm.team1_name, mm.team2_name, mm.team1_score, mm.team2_score,
+                       mp.mapname, mm.end_time
+                FROM {MATCHZY_TABLES['matches']} mm
+                LEFT JOIN {MATCHZY_TABLES['maps']} mp ON mm.matchid = mp.matchid
+                WHERE mm.matchid = %s LIMIT 1
+            """, (match_id,))
+            row = c.fetchone()
+            c.close()
+            return row
+
+    row = await loop.run_in_executor(None, fetch_match)
     if not row:
         return await inter.followup.send(f"❌ Match `#{match_id}` not found.", ephemeral=True)
     # Build URL
@@ -3339,15 +4050,9 @@ async def match_cmd(inter: discord.Interaction, match_id: str):
     )
     embed.add_field(name="📊 Stats Page", value=f"[View Full Scoreboard]({url})", inline=False)
     
-    # Try to find demo using matchid first (EXACT MATCH via .json), then fall back to timestamp
-    demo_name, demo_url = find_demo_for_match(match_id)  # Try match ID first
-    if not demo_url or demo_url == "#":
-        # Fallback to timestamp matching
-        end_time = row.get("end_time")
-        if end_time:
-            demo_name, demo_url = find_demo_for_match(end_time)
-    
-    if demo_url and demo_url != "#":
+    # Demo via matchid first (EXACT MATCH via .json), then timestamp fallback
+    demo_url = await loop.run_in_executor(None, _demo_url_for_match, match_id, row.get("end_time"))
+    if demo_url:
         embed.add_field(name="📥 Demo", value=f"[Download Demo](<{demo_url}>)", inline=False)
     
     await inter.followup.send(embed=embed, ephemeral=False)
@@ -3357,7 +4062,8 @@ async def demos_cmd(inter: discord.Interaction):
     if SERVER_DEMOS_CHANNEL_ID and inter.channel_id != SERVER_DEMOS_CHANNEL_ID:
         return await inter.response.send_message("Wrong channel!", ephemeral=True)
     await inter.response.defer(ephemeral=True)
-    result = fetch_demos(0, 5)
+    view = DemosView(offset=0)
+    result = await fetch_demos(0, 5)
     embed = discord.Embed(
         title="🎥 Server Demos",
         description="\n\n".join(result["demos"]),
@@ -3365,11 +4071,11 @@ async def demos_cmd(inter: discord.Interaction):
     )
     if result.get("total"):
         embed.set_footer(text=f"Showing {result['showing']} of {result['total']} demos")
-    view = DemosView(offset=0)
     if not result.get("has_more", False):
         for item in view.children:
             if item.custom_id == "next":
                 item.disabled = True
+    view._last_render = view.render_key(embed)
     await inter.followup.send(embed=embed, view=view, ephemeral=True)
 
 
@@ -3378,28 +4084,28 @@ async def demos_cmd(inter: discord.Interaction):
 @owner_only()
 async def csssay(inter: discord.Interaction, message: str):
     await inter.response.defer(ephemeral=True)
-    resp = send_rcon(f"css_cssay {message}")
+    resp = await send_rcon(f"css_cssay {message}")
     await inter.followup.send(f"📢 **Message Sent**\n```{message}```\n{resp}", ephemeral=True)
 
 @bot.tree.command(name="csshsay", description="Send hint message to all players")
 @owner_only()
 async def csshsay(inter: discord.Interaction, message: str):
     await inter.response.defer(ephemeral=True)
-    resp = send_rcon(f"css_hsay {message}")
+    resp = await send_rcon(f"css_hsay {message}")
     await inter.followup.send(f"💬 **Hint Sent**\n```{message}```\n{resp}", ephemeral=True)
 
 @bot.tree.command(name="csskick", description="Kick a player from the server")
 @owner_only()
 async def csskick(inter: discord.Interaction, player: str):
     await inter.response.defer(ephemeral=True)
-    resp = send_rcon(f'css_kick "{player}"')
+    resp = await send_rcon(f'css_kick "{player}"')
     await inter.followup.send(f"👢 **Kick Command**\nPlayer: `{player}`\n\n{resp}", ephemeral=True)
 
 @bot.tree.command(name="cssban", description="Ban a player from the server")
 @owner_only()
 async def cssban(inter: discord.Interaction, player: str, minutes: int, reason: str = "No reason"):
     await inter.response.defer(ephemeral=True)
-    resp = send_rcon(f'css_ban "{player}" {minutes} "{reason}"')
+    resp = await send_rcon(f'css_ban "{player}" {minutes} "{reason}"')
     await inter.followup.send(
         f"🔨 **Ban**\nPlayer: `{player}` • Duration: `{minutes}m` • Reason: `{reason}`\n\n{resp}",
         ephemeral=True
@@ -3413,7 +4119,7 @@ async def csschangemap(inter: discord.Interaction, map: str):
             f"❌ Map `{map}` not allowed.\nAllowed: {', '.join(MAP_WHITELIST)}", ephemeral=True
         )
     await inter.response.defer(ephemeral=True)
-    resp = send_rcon(f"css_changemap {map}")
+    resp = await send_rcon(f"css_changemap {map}")
     await inter.followup.send(f"🗺️ Changing to `{map}`\n\n{resp}", ephemeral=True)
 
 @csschangemap.autocomplete("map")
@@ -3423,86 +4129,141 @@ async def autocomplete_map(inter, current: str):
 @bot.tree.command(name="cssreload")
 @owner_only()
 async def cssreload(inter):
-    resp = send_rcon("css_reloadplugins")
+    resp = await send_rcon("css_reloadplugins")
     await inter.response.send_message(resp, ephemeral=True)
 
+def _chunk_lines(lines: list, limit: int = 1900) -> list:
+    """Greedily pack lines into messages under Discord's 2000-char limit without splitting a line."""
+    chunks, cur, cur_len = [], [], 0
+    for line in lines:
+        line = line[:limit]
+        if cur and cur_len + len(line) + 1 > limit:
+            chunks.append("\n".join(cur))
+            cur, cur_len = [], 0
+        cur.append(line)
+        cur_len += len(line) + 1
+    if cur:
+        chunks.append("\n".join(cur))
+    return chunks
+
 @bot.tree.command(name="debugdb", description="Debug database + MatchZy connection")
 @owner_only()
 async def debugdb_cmd(inter: discord.Interaction):
     await inter.response.defer(ephemeral=True)
     lines = []
+
+    def fetch():
+        with db_conn() as conn:
+            c = conn.cursor()
+            # Check MatchZy (memoized; /refreshdb re-probes)
+            has_mz = matchzy_tables_exist(conn)
+            lines.append(f"**MatchZy tables:** {'✅ Found' if has_mz else '❌ Not found'}")
+
+            # Every count in a single round trip; the bot's own tables always exist
+            counts = [
+                ("fshost matches", "SELECT COUNT(*) FROM fshost_matches"),
+                ("Match edits", "SELECT COUNT(*) FROM match_edits"),
+                ("Career summary rows", "SELECT COUNT(*) FROM player_career_summary"),
+            ]
+            if has_mz:
+                counts[:0] = [
+                    ("MatchZy player rows", f"SELECT COUNT(*) FROM {MATCHZY_TABLES['players']}"),
+                    ("MatchZy matches", f"SELECT COUNT(DISTINCT matchid) FROM {MATCHZY_TABLES['players']}"),
+                ]
+            c.execute("SELECT " + ", ".join(f"({sql})" for _, sql in counts))
+            for (label, _), value in zip(counts, c.fetchone()):
+                lines.append(f"**{label}:** {value}")
+            c.close()
+
     try:
-        conn = get_db()
-        c = conn.cursor()
-        
-        # Check MatchZy
-        has_mz = matchzy_tables_exist(conn)
-        lines.append(f"**MatchZy tables:** {'✅ Found' if has_mz else '❌ Not found'}")
-        
-        if has_mz:
-            c.execute(f"SELECT COUNT(*) FROM {MATCHZY_TABLES['players']}")
-            rows = c.fetchone()[0]
-            lines.append(f"**MatchZy player rows:** {rows}")
-            c.execute(f"SELECT COUNT(DISTINCT matchid) FROM {MATCHZY_TABLES['players']}")
-            matches = c.fetchone()[0]
-            lines.append(f"**MatchZy matches:** {matches}")
-        
-        
-        c.close()
-        conn.close()
+        await asyncio.get_running_loop().run_in_executor(None, fetch)
     except Exception as e:
         lines.append(f"❌ DB Error: {e}")
-    
+
     await inter.followup.send("\n".join(lines), ephemeral=True)
 
+@bot.tree.command(name="refreshdb", description="Re-check MatchZy tables in the database")
+@owner_only()
+async def refreshdb_cmd(inter: discord.Interaction):
+    global _HAS_MATCHZY
+    await inter.response.defer(ephemeral=True)
+
+    def probe():
+        with db_conn() as conn:
+            return matchzy_tables_exist(conn, refresh=True)
+
+    try:
+        has_mz = await asyncio.get_running_loop().run_in_executor(None, probe)
+        await inter.followup.send(
+            f"**MatchZy tables:** {'✅ Found' if has_mz else '❌ Not found'}", ephemeral=True
+        )
+    except Exception as e:
+        _HAS_MATCHZY = None
+        await inter.followup.send(f"❌ DB Error: {e}", ephemeral=True)
+
 @bot.tree.command(name="debugmatch", description="Debug a specific match data")
 @owner_only()
 async def debugmatch_cmd(inter: discord.Interaction, match_id: str):
     await inter.response.defer(ephemeral=True)
     lines = [f"**Debugging Match #{match_id}**\n"]
-    try:
-        conn = get_db()
-        c = conn.cursor(dictionary=True)
+
+    def fetch():
+        with db_conn() as conn:
+            c = conn.cursor(dictionary=True)
         
-        # Get match data
-        c.execute(f"SELECT * FROM {MATCHZY_TABLES['matches']} WHERE matchid=%s", (match_id,))
-        match = c.fetchone()
-        if match:
-            lines.append(f"✅ Match found")
-            lines.append(f"Teams: {match.get('team1_name')} vs {match.get('team2_name')}")
-            lines.append(f"Score: {match.get('team1_score')} : {match.get('team2_score')}")
-        else:
+            # Match, players and maps in one round trip; players capped server-side
+            # since the output is truncated anyway
+            c.execute(f"""
+                SELECT m.team1_name, m.team2_name, m.team1_score, m.team2_score,
+                       (SELECT COUNT(*) FROM {MATCHZY_TABLES['players']} WHERE matchid = m.matchid) AS player_total,
+                       p.name, p.team, p.mapnumber, p.kills, p.deaths,
+                       mp.mapnumber AS mn, mp.mapname, mp.team1_score AS ms1, mp.team2_score AS ms2
+                FROM {MATCHZY_TABLES['matches']} m
+                LEFT JOIN (
+                    SELECT matchid, name, team, mapnumber, kills, deaths
+                    FROM {MATCHZY_TABLES['players']}
+                    WHERE matchid = %s
+                    ORDER BY mapnumber, kills DESC
+                    LIMIT 64
+                ) p ON p.matchid = m.matchid
+                LEFT JOIN {MATCHZY_TABLES['maps']} mp ON mp.matchid = m.matchid
+                WHERE m.matchid = %s
+            """, (match_id, match_id))
+            rows = c.fetchall()
+            c.close()
+            return rows
+
+    try:
+        rows = await asyncio.get_running_loop().run_in_executor(None, fetch)
+        if not rows:
             lines.append(f"❌ Match not found")
-            c.close(); conn.close()
             return await inter.followup.send("\n".join(lines), ephemeral=True)
         
-        # Get player data
-        c.execute(f"SELECT name, team, kills, deaths, mapnumber FROM {MATCHZY_TABLES['players']} WHERE matchid=%s", (match_id,))
-        players = c.fetchall()
-        lines.append(f"\n**Players ({len(players)} total):**")
-        for p in players:
+        # Demultiplex the joined rows back into match / players / maps
+        match = rows[0]
+        players, maps = {}, {}
+        for r in rows:
+            if r['name'] is not None:
+                players.setdefault((r['name'], r['team'], r['mapnumber']), r)
+            if r['mn'] is not None:
+                maps.setdefault(r['mn'], r)
+        lines.append(f"✅ Match found")
+        lines.append(f"Teams: {match.get('team1_name')} vs {match.get('team2_name')}")
+        lines.append(f"Score: {match.get('team1_score')} : {match.get('team2_score')}")
+        
+        lines.append(f"\n**Players ({match['player_total']} total):**")
+        for p in players.values():
             lines.append(f"• {p['name']} | Team: `{p['team']}` | Map: {p['mapnumber']} | K/D: {p['kills']}/{p['deaths']}")
         
-        # Get map data
-        c.execute(f"SELECT * FROM {MATCHZY_TABLES['maps']} WHERE matchid=%s", (match_id,))
-        maps = c.fetchall()
         lines.append(f"\n**Maps ({len(maps)} total):**")
-        for m in maps:
-            lines.append(f"• Map {m.get('mapnumber')}: {m.get('mapname')} ({m.get('team1_score')} : {m.get('team2_score')})")
-        
-        c.close()
-        conn.close()
+        for m in maps.values():
+            lines.append(f"• Map {m['mn']}: {m['mapname']} ({m['ms1']} : {m['ms2']})")
     except Exception as e:
         lines.append(f"\n❌ Error: {e}")
     
     # Split into multiple messages if too long
-    message = "\n".join(lines)
-    if len(message) > 2000:
-        chunks = [message[i:i+2000] for i in range(0, len(message), 2000)]
-        for chunk in chunks:
-            await inter.followup.send(chunk, ephemeral=True)
-    else:
-        await inter.followup.send(message, ephemeral=True)
+    for chunk in _chunk_lines(lines):
+        await inter.followup.send(chunk, ephemeral=True)
 
 @bot.tree.command(name="debugdemos", description="Show match ID to demo mapping from .json files")
 @owner_only()
@@ -3520,7 +4281,8 @@ async def debugdemos_cmd(inter: discord.Interaction, refresh: bool = False):
         if refresh:
             lines.append("🔄 Refreshing cache...\n")
         
-        matchid_map = build_matchid_to_demo_map(force_refresh=refresh)
+        matchid_map = await asyncio.get_running_loop().run_in_executor(
+            None, build_matchid_to_demo_map, refresh)
         
         if not matchid_map:
             lines.append("❌ No demos with .json metadata found")
@@ -3551,13 +4313,8 @@ async def debugdemos_cmd(inter: discord.Interaction, refresh: bool = False):
     except Exception as e:
         lines.append(f"\n❌ Error: {e}")
     
-    message = "\n".join(lines)
-    if len(message) > 2000:
-        chunks = [message[i:i+2000] for i in range(0, len(message), 2000)]
-        for chunk in chunks:
-            await inter.followup.send(chunk, ephemeral=True)
-    else:
-        await inter.followup.send(message, ephemeral=True)
+    for chunk in _chunk_lines(lines):
+        await inter.followup.send(chunk, ephemeral=True)
 
 
 @bot.tree.command(name="syncdemos", description="Force re-sync all fshost JSONs into the database now")